@@ -0,0 +1,10 @@
+"""Response classes shared by the FastAPI servers."""
+import orjson
+from fastapi.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib encoder"""
+    
+    def render(self, content) -> bytes:
+        # FastAPI runs jsonable_encoder before render, so content is plain Python here
+        return orjson.dumps(content)
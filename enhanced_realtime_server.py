@@ -1,20 +1,27 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Optional
 import uvicorn
-import json
+import hashlib
+import orjson
+import os
+import re
 import time
-from datetime import datetime, timedelta
-import threading
+from datetime import datetime
 import asyncio
+from collections import OrderedDict, deque
+from functools import lru_cache
+from heapq import nlargest
+from api_responses import ORJSONResponse
 from twitter_integration import TwitterIntegrationService
 
-# Initialize FastAPI app
 app = FastAPI(
     title="Real-Time Disaster Tweet Triage API",
     description="Enhanced API with real-time Twitter integration for disaster monitoring",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS
@@ -27,21 +34,62 @@ app.add_middleware(
 )
 
 # Global variables for real-time data
-live_tweets = []
-tweet_cache = {}
+live_tweets = deque(maxlen=100)  # Live feed keeps only the last 100 tweets
+tweet_cache = OrderedDict()  # Bounded cache, oldest tweets are evicted first
+tweet_counters = {"disaster": 0, "normal": 0}
+recent_activity = deque()  # (processed_at epoch, is_disaster) within the last hour
+recent_disaster_count = 0
+TWEET_CACHE_MAX_SIZE = 100000
+RECENT_ACTIVITY_WINDOW = 3600
 streaming_status = {"active": False, "last_update": None}
 twitter_service = None
+event_loop = None  # Shared state is only mutated on this loop's thread
+cached_now_iso = None  # Refreshed every second by _tick_clock
+clock_task = None
+pending_batches = set()  # _apply_batch tasks scheduled from the loop thread
+
+# Optional Redis store shared by all workers (enabled by REDIS_URL)
+redis_client = None
+REDIS_CACHE_KEY = "disaster_triage:tweet_cache"
+REDIS_CACHE_INDEX_KEY = "disaster_triage:tweet_cache_index"  # id -> processed_at_ts, eviction order
+REDIS_CACHE_DISASTER_KEY = "disaster_triage:tweet_cache_disaster"  # id -> priority_score
+REDIS_LIVE_KEY = "disaster_triage:live_tweets"
+REDIS_RECENT_KEY = "disaster_triage:recent_activity"
+REDIS_RECENT_DISASTER_KEY = "disaster_triage:recent_disaster"
+
+# Trim the Redis tweet cache to ARGV[1] entries, oldest first, in one atomic step
+REDIS_EVICT_SCRIPT = """
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[1])
+if excess <= 0 then
+    return 0
+end
+local evicted = redis.call('ZPOPMIN', KEYS[1], excess)
+for i = 1, #evicted, 2 do
+    redis.call('HDEL', KEYS[2], evicted[i])
+    redis.call('ZREM', KEYS[3], evicted[i])
+end
+return excess
+"""
+
+# Read-only endpoints may be served from client/proxy caches this long
+CACHE_MAX_AGE = 5
 
 # Pydantic models
 class TweetInput(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     text: str
     location: Optional[str] = ""
     keyword: Optional[str] = ""
 
 class BatchTweetInput(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     tweets: List[TweetInput]
 
 class StreamingConfig(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    
     enabled: bool
     interval: Optional[int] = 30
     max_tweets: Optional[int] = 100
@@ -59,43 +107,295 @@ def initialize_twitter_service():
         print(f"❌ Failed to initialize Twitter service: {e}")
         return False
 
-# Background task for real-time tweet streaming
-def handle_new_tweets(tweets: List[Dict]):
-    """Handle new tweets from the streaming service"""
-    global live_tweets, tweet_cache, streaming_status
+async def initialize_redis():
+    """Connect to the shared Redis tweet store if REDIS_URL is configured"""
+    global redis_client
+    
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return False
     
-    current_time = datetime.now()
+    try:
+        import redis.asyncio as redis
+        client = redis.Redis.from_url(redis_url)
+        await client.ping()
+        redis_client = client
+        print("✅ Connected to shared Redis tweet store")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to connect to Redis, using in-process tweet store: {e}")
+        redis_client = None
+        return False
+
+def _now_iso() -> str:
+    """Current time as an ISO string at second precision"""
+    return cached_now_iso or datetime.now().isoformat(timespec="seconds")
+
+async def _tick_clock():
+    """Keep cached_now_iso current so endpoints skip per-request formatting"""
+    global cached_now_iso
+    while True:
+        cached_now_iso = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(1)
+
+def _count_tweet(tweet: Dict, delta: int):
+    """Adjust the disaster/normal counters for a cached tweet"""
+    key = "disaster" if tweet.get('is_disaster', False) else "normal"
+    tweet_counters[key] += delta
+
+def _cache_tweet(tweet: Dict):
+    """Store a tweet in the bounded cache, keeping counters in sync"""
+    previous = tweet_cache.pop(tweet['id'], None)
+    if previous is not None:
+        _count_tweet(previous, -1)
+    
+    tweet_cache[tweet['id']] = tweet
+    _count_tweet(tweet, 1)
+    
+    while len(tweet_cache) > TWEET_CACHE_MAX_SIZE:
+        _, evicted = tweet_cache.popitem(last=False)
+        _count_tweet(evicted, -1)
+
+def _expire_recent_activity(now: float):
+    """Drop activity entries that fell out of the sliding window"""
+    global recent_disaster_count
+    
+    threshold = now - RECENT_ACTIVITY_WINDOW
+    while recent_activity and recent_activity[0][0] <= threshold:
+        _, is_disaster = recent_activity.popleft()
+        if is_disaster:
+            recent_disaster_count -= 1
+
+async def _store_tweets_redis(tweets: List[Dict], now: float):
+    """Write a batch of tweets to the shared Redis store in one round trip"""
+    pipe = redis_client.pipeline()
     
     for tweet in tweets:
-        # Add timestamp and processing info
-        tweet['processed_at'] = current_time.isoformat()
-        tweet['source'] = 'twitter_stream'
+        payload = orjson.dumps(tweet)
+        tweet_id = tweet['id']
+        is_disaster = tweet.get('is_disaster', False)
         
-        # Add to live tweets (keep only recent ones)
+        # Counters are the index sizes, so re-cached ids are never counted twice
+        pipe.hset(REDIS_CACHE_KEY, tweet_id, payload)
+        pipe.zadd(REDIS_CACHE_INDEX_KEY, {tweet_id: tweet['processed_at_ts']})
+        if is_disaster:
+            pipe.zadd(REDIS_CACHE_DISASTER_KEY, {tweet_id: tweet.get('priority_score') or 0})
+        else:
+            pipe.zrem(REDIS_CACHE_DISASTER_KEY, tweet_id)
+        
+        pipe.lpush(REDIS_LIVE_KEY, payload)
+        pipe.zadd(REDIS_RECENT_KEY, {tweet_id: tweet['processed_at_ts']})
+        if is_disaster:
+            pipe.zadd(REDIS_RECENT_DISASTER_KEY, {tweet_id: tweet['processed_at_ts']})
+    
+    # Bound the cache like _cache_tweet, and keep only the newest entries in
+    # the live feed and activity window
+    pipe.eval(REDIS_EVICT_SCRIPT, 3, REDIS_CACHE_INDEX_KEY, REDIS_CACHE_KEY,
+              REDIS_CACHE_DISASTER_KEY, TWEET_CACHE_MAX_SIZE)
+    pipe.ltrim(REDIS_LIVE_KEY, 0, live_tweets.maxlen - 1)
+    pipe.zremrangebyscore(REDIS_RECENT_KEY, "-inf", now - RECENT_ACTIVITY_WINDOW)
+    pipe.zremrangebyscore(REDIS_RECENT_DISASTER_KEY, "-inf", now - RECENT_ACTIVITY_WINDOW)
+    await pipe.execute()
+
+def _store_tweets_local(tweets: List[Dict], now: float):
+    """Write a batch of tweets to the in-process store"""
+    global recent_disaster_count
+    
+    for tweet in tweets:
+        # Add to live tweets (the deque drops the oldest beyond 100)
         live_tweets.append(tweet)
         
-        # Cache the tweet
-        tweet_cache[tweet['id']] = tweet
+        # Cache the tweet and record it in the recent activity window
+        _cache_tweet(tweet)
+        is_disaster = tweet.get('is_disaster', False)
+        recent_activity.append((tweet['processed_at_ts'], is_disaster))
+        if is_disaster:
+            recent_disaster_count += 1
+    
+    _expire_recent_activity(now)
+
+async def _live_tweets_snapshot() -> List[Dict]:
+    """Return the live feed ordered from oldest to newest"""
+    if redis_client:
+        payloads = await redis_client.lrange(REDIS_LIVE_KEY, 0, -1)
+        return [orjson.loads(payload) for payload in reversed(payloads)]
+    return list(live_tweets)
+
+async def _cached_disaster_tweets(limit: int, seen_ids) -> tuple:
+    """(candidate top-`limit` cached disaster tweets, how many cached ones are not in seen_ids)"""
+    if redis_client:
+        # Only the highest-priority payloads are fetched and decoded
+        pipe = redis_client.pipeline()
+        pipe.zrevrange(REDIS_CACHE_DISASTER_KEY, 0, max(limit, 1) - 1)
+        pipe.zcard(REDIS_CACHE_DISASTER_KEY)
+        if seen_ids:
+            pipe.zmscore(REDIS_CACHE_DISASTER_KEY, list(seen_ids))
+        results = await pipe.execute()
+        
+        ids, total = results[0], results[1]
+        overlap = sum(score is not None for score in results[2]) if seen_ids else 0
+        payloads = await redis_client.hmget(REDIS_CACHE_KEY, ids) if ids and limit > 0 else []
+        return [orjson.loads(payload) for payload in payloads if payload is not None], total - overlap
+    
+    tweets = [
+        tweet for tweet in tweet_cache.values()
+        if tweet.get('is_disaster', False) and tweet['id'] not in seen_ids
+    ]
+    return tweets, len(tweets)
+
+async def _cache_size() -> int:
+    """Number of cached tweets"""
+    if redis_client:
+        return await redis_client.hlen(REDIS_CACHE_KEY)
+    return len(tweet_cache)
+
+async def _live_size() -> int:
+    """Number of tweets in the live feed"""
+    if redis_client:
+        return await redis_client.llen(REDIS_LIVE_KEY)
+    return len(live_tweets)
+
+async def _cache_counters() -> Dict[str, int]:
+    """Disaster/normal totals for the cached tweets"""
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.zcard(REDIS_CACHE_INDEX_KEY)
+        pipe.zcard(REDIS_CACHE_DISASTER_KEY)
+        total, disaster = await pipe.execute()
+        return {"disaster": disaster, "normal": total - disaster}
+    return dict(tweet_counters)
+
+async def _recent_activity_counts(now: float) -> tuple:
+    """(total, disaster) tweets processed within the activity window"""
+    threshold = now - RECENT_ACTIVITY_WINDOW
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.zremrangebyscore(REDIS_RECENT_KEY, "-inf", threshold)
+        pipe.zremrangebyscore(REDIS_RECENT_DISASTER_KEY, "-inf", threshold)
+        pipe.zcard(REDIS_RECENT_KEY)
+        pipe.zcard(REDIS_RECENT_DISASTER_KEY)
+        _, _, total, disaster = await pipe.execute()
+        return total, disaster
+    
+    _expire_recent_activity(now)
+    return len(recent_activity), recent_disaster_count
+
+async def _apply_batch(tweets: List[Dict]):
+    """Record a batch of new tweets; must run on the event loop"""
+    global streaming_status
     
-    # Keep only last 100 tweets in live feed
-    live_tweets = live_tweets[-100:]
+    # Stamp the whole batch once: epoch for window math, ISO for clients
+    now = time.time()
+    processed_at = datetime.fromtimestamp(now).isoformat()
+    
+    for tweet in tweets:
+        # Add timestamp and processing info
+        tweet['processed_at'] = processed_at
+        tweet['processed_at_ts'] = now
+        tweet['source'] = 'twitter_stream'
+    
+    if redis_client:
+        await _store_tweets_redis(tweets, now)
+    else:
+        _store_tweets_local(tweets, now)
     
     # Update streaming status
-    streaming_status['last_update'] = current_time.isoformat()
-    streaming_status['total_processed'] = len(tweet_cache)
+    cache_size = await _cache_size()
+    streaming_status['last_update'] = processed_at
+    streaming_status['total_processed'] = cache_size
+    
+    print(f"📡 Processed {len(tweets)} new disaster tweets (Total cached: {cache_size})")
+
+async def _state_etag(request: Request) -> str:
+    """ETag for this URL and the tweet state, rolled over every CACHE_MAX_AGE seconds"""
+    state = ":".join(str(part) for part in (
+        request.url.path,
+        request.url.query,
+        streaming_status.get('last_update'),
+        streaming_status.get('active'),
+        await _cache_size(),
+        await _live_size(),
+        int(time.time() // CACHE_MAX_AGE)
+    ))
+    return '"' + hashlib.sha1(state.encode()).hexdigest() + '"'
+
+async def _conditional_response(request: Request, response: Response) -> Optional[Response]:
+    """Attach cache validators, returning a 304 when the client copy is current"""
+    etag = await _state_etag(request)
+    headers = {"ETag": etag, "Cache-Control": f"max-age={CACHE_MAX_AGE}"}
     
-    print(f"📡 Processed {len(tweets)} new disaster tweets (Total cached: {len(tweet_cache)})")
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+def _stream_tweets_response(tweets: List[Dict], fields: Dict,
+                            headers: Optional[Dict] = None) -> StreamingResponse:
+    """Stream {"tweets": [...], **fields} one encoded tweet at a time"""
+    async def body():
+        yield b'{"tweets":['
+        for index, tweet in enumerate(tweets):
+            if index:
+                yield b','
+            yield orjson.dumps(tweet)
+        yield (b'],' + orjson.dumps(fields)[1:]) if fields else b']}'
+    
+    return StreamingResponse(body(), media_type="application/json", headers=headers)
+
+def _report_batch_error(future):
+    """Print a failed _apply_batch, whose exception would otherwise be dropped"""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"❌ Failed to apply tweet batch: {future.exception()}")
+
+# Background task for real-time tweet streaming
+def handle_new_tweets(tweets: List[Dict]):
+    """Handle new tweets from the streaming service"""
+    try:
+        on_loop = asyncio.get_running_loop() is event_loop
+    except RuntimeError:
+        on_loop = False
+    
+    if event_loop is None:
+        asyncio.run(_apply_batch(tweets))
+    elif on_loop:
+        task = asyncio.create_task(_apply_batch(tweets))
+        pending_batches.add(task)
+        task.add_done_callback(pending_batches.discard)
+        task.add_done_callback(_report_batch_error)
+    else:
+        # Called from the streaming thread: hand the batch to the event loop
+        future = asyncio.run_coroutine_threadsafe(_apply_batch(tweets), event_loop)
+        future.add_done_callback(_report_batch_error)
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    global event_loop, clock_task
+    
+    event_loop = asyncio.get_running_loop()
+    clock_task = asyncio.create_task(_tick_clock())
+    await initialize_redis()
     success = initialize_twitter_service()
     if success:
         print("🚀 Real-time disaster tweet triage API started successfully")
     else:
         print("⚠️ API started with limited functionality")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background clock task"""
+    global clock_task
+    
+    task, clock_task = clock_task, None
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -104,12 +404,12 @@ async def health_check():
     
     health_status = {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "model_loaded": bool(twitter_service and twitter_service.model),
         "twitter_service": "active" if twitter_service else "inactive",
         "streaming": streaming_status,
-        "cached_tweets": len(tweet_cache),
-        "live_tweets": len(live_tweets)
+        "cached_tweets": await _cache_size(),
+        "live_tweets": await _live_size()
     }
     
     if twitter_service:
@@ -117,6 +417,117 @@ async def health_check():
     
     return health_status
 
+# Sample coordinates for known locations, indexed by lowercase city name
+LOCATION_MAP = {
+    'san francisco': [37.7749, -122.4194],
+    'los angeles': [34.0522, -118.2437],
+    'new york': [40.7128, -74.0060],
+    'houston': [29.7604, -95.3698],
+    'chicago': [41.8781, -87.6298]
+}
+LOCATION_MAX_WORDS = max(len(city.split()) for city in LOCATION_MAP)
+LOCATION_TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+# "lat, lon" pairs given directly as the location
+COORDINATE_PATTERN = re.compile(
+    r'^\s*([-+]?(?:\d+\.?\d*|\.\d+))\s*,\s*([-+]?(?:\d+\.?\d*|\.\d+))\s*$'
+)
+
+# Priority factor keywords
+KEYWORD_BOOST_PATTERN = re.compile(r'fire|earthquake|flood', re.IGNORECASE)
+URGENCY_BOOST_WORDS = frozenset(['urgent', 'emergency', 'help'])
+TEXT_TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+@lru_cache(maxsize=10000)
+def _lookup_known_location(location: str) -> Optional[List[float]]:
+    """Match a free-text location against LOCATION_MAP by word n-grams"""
+    location_lower = location.lower()
+    coords = LOCATION_MAP.get(location_lower)
+    if coords:
+        return coords
+    
+    tokens = LOCATION_TOKEN_PATTERN.findall(location_lower)
+    for size in range(LOCATION_MAX_WORDS, 0, -1):
+        for start in range(len(tokens) - size + 1):
+            coords = LOCATION_MAP.get(' '.join(tokens[start:start + size]))
+            if coords:
+                return coords
+    return None
+
+def _predict_one(tweet: TweetInput, classification: Optional[Dict] = None,
+                 priority_score: Optional[float] = None) -> Dict:
+    """Classify, score and geolocate a single tweet"""
+    # Lowercase and tokenize the text once for every step below
+    text_lower = tweet.text.lower()
+    tokens = set(TEXT_TOKEN_PATTERN.findall(text_lower))
+    
+    # Use the Twitter service's classification, memoized by the service on normalized text
+    if classification is None:
+        classification = twitter_service.classify_tweet(text_lower.strip())
+    
+    # Calculate priority score
+    if priority_score is None:
+        priority_score = twitter_service.calculate_priority_score(
+            tweet.text, tweet.location, classification['confidence']
+        )
+    
+    # Get geolocation if available
+    coordinates = None
+    geolocation_confidence = 0.0
+    
+    if tweet.location:
+        # Simple coordinate extraction (enhanced version would use geocoding API)
+        match = COORDINATE_PATTERN.match(tweet.location)
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                coordinates = [lat, lon]
+                geolocation_confidence = 0.8
+        
+        if not coordinates:
+            # Use sample coordinates for known locations
+            coordinates = _lookup_known_location(tweet.location)
+            if coordinates:
+                geolocation_confidence = 0.9
+    
+    # Enhanced priority factors
+    priority_factors = {
+        "base_confidence": classification['confidence'],
+        "keyword_boost": 0.1 if tweet.keyword and KEYWORD_BOOST_PATTERN.search(tweet.keyword) else 0.0,
+        "location_boost": 0.2 if coordinates else (0.1 if tweet.location else 0.0),
+        "urgency_boost": 0.3 if not tokens.isdisjoint(URGENCY_BOOST_WORDS) else 0.0,
+        "geolocation_confidence": geolocation_confidence
+    }
+    
+    return {
+        "text": tweet.text,
+        "is_disaster": classification['is_disaster'],
+        "confidence": classification['confidence'],
+        "priority_score": priority_score,
+        "coordinates": coordinates,
+        "geolocation_confidence": geolocation_confidence,
+        "priority_factors": priority_factors,
+        "classification_method": classification.get('method', 'unknown'),
+        "processed_at": _now_iso()
+    }
+
+def _predict_many(tweets: List[TweetInput]) -> List[Dict]:
+    """Predict a batch of tweets sharing a single classification call"""
+    texts = [t.text for t in tweets]
+    classifications = twitter_service.classify_tweets_batch(texts)
+    priority_scores = twitter_service.calculate_priority_scores_batch(
+        texts, [t.location for t in tweets], [c['confidence'] for c in classifications]
+    )
+    
+    results = []
+    for tweet, classification, priority_score in zip(tweets, classifications, priority_scores):
+        try:
+            results.append(_predict_one(tweet, classification, priority_score))
+        except Exception as e:
+            # Continue processing other tweets even if one fails
+            print(f"Error processing tweet: {e}")
+    return results
+
 # Single tweet prediction (enhanced)
 @app.post("/predict")
 async def predict_tweet(tweet: TweetInput):
@@ -127,89 +538,27 @@ async def predict_tweet(tweet: TweetInput):
         raise HTTPException(status_code=503, detail="Twitter service not available")
     
     try:
-        # Use the Twitter service's classification
-        classification = twitter_service.classify_tweet(tweet.text)
-        
-        # Calculate priority score
-        priority_score = twitter_service.calculate_priority_score(
-            tweet.text, tweet.location, classification['confidence']
-        )
-        
-        # Get geolocation if available
-        coordinates = None
-        geolocation_confidence = 0.0
-        
-        if tweet.location:
-            # Simple coordinate extraction (enhanced version would use geocoding API)
-            if ',' in tweet.location and any(c.isdigit() for c in tweet.location):
-                try:
-                    parts = tweet.location.split(',')
-                    if len(parts) == 2:
-                        lat, lon = float(parts[0].strip()), float(parts[1].strip())
-                        if -90 <= lat <= 90 and -180 <= lon <= 180:
-                            coordinates = [lat, lon]
-                            geolocation_confidence = 0.8
-                except:
-                    pass
-            
-            if not coordinates:
-                # Use sample coordinates for known locations
-                location_map = {
-                    'san francisco': [37.7749, -122.4194],
-                    'los angeles': [34.0522, -118.2437],
-                    'new york': [40.7128, -74.0060],
-                    'houston': [29.7604, -95.3698],
-                    'chicago': [41.8781, -87.6298]
-                }
-                
-                for city, coords in location_map.items():
-                    if city in tweet.location.lower():
-                        coordinates = coords
-                        geolocation_confidence = 0.9
-                        break
-        
-        # Enhanced priority factors
-        priority_factors = {
-            "base_confidence": classification['confidence'],
-            "keyword_boost": 0.1 if tweet.keyword and any(kw in tweet.keyword.lower() for kw in ['fire', 'earthquake', 'flood']) else 0.0,
-            "location_boost": 0.2 if coordinates else (0.1 if tweet.location else 0.0),
-            "urgency_boost": 0.3 if any(word in tweet.text.lower() for word in ['urgent', 'emergency', 'help']) else 0.0,
-            "geolocation_confidence": geolocation_confidence
-        }
-        
-        return {
-            "text": tweet.text,
-            "is_disaster": classification['is_disaster'],
-            "confidence": classification['confidence'],
-            "priority_score": priority_score,
-            "coordinates": coordinates,
-            "geolocation_confidence": geolocation_confidence,
-            "priority_factors": priority_factors,
-            "classification_method": classification.get('method', 'unknown'),
-            "processed_at": datetime.now().isoformat()
-        }
-        
+        return await asyncio.to_thread(_predict_one, tweet)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 # Batch prediction
 @app.post("/predict_batch")
-async def predict_batch(batch: BatchTweetInput):
+async def predict_batch(batch: BatchTweetInput, limit: Optional[int] = None):
     """Predict multiple tweets and return sorted by priority"""
-    results = []
+    global twitter_service
     
-    for tweet_input in batch.tweets:
-        try:
-            result = await predict_tweet(tweet_input)
-            results.append(result)
-        except Exception as e:
-            # Continue processing other tweets even if one fails
-            print(f"Error processing tweet: {e}")
-            continue
+    if not twitter_service:
+        return []
     
-    # Sort by priority score (highest first)
-    results.sort(key=lambda x: x['priority_score'], reverse=True)
+    # Classify the whole batch in one vectorized call, off the event loop
+    results = await asyncio.to_thread(_predict_many, batch.tweets)
+    
+    # Sort by priority score (highest first), or just pick the top `limit`
+    if limit is not None:
+        return nlargest(limit, results, key=lambda x: x['priority_score'])
     
+    results.sort(key=lambda x: x['priority_score'], reverse=True)
     return results
 
 # Real-time tweet streaming endpoints
@@ -232,8 +581,8 @@ async def start_streaming(config: StreamingConfig):
         )
         
         streaming_status['active'] = True
-        streaming_status['started_at'] = datetime.now().isoformat()
-        streaming_status['config'] = config.dict()
+        streaming_status['started_at'] = _now_iso()
+        streaming_status['config'] = config.model_dump()
         
         return {
             "message": "Real-time streaming started successfully",
@@ -252,9 +601,10 @@ async def stop_streaming():
         raise HTTPException(status_code=503, detail="Twitter service not available")
     
     try:
-        twitter_service.stop_streaming()
+        # stop_streaming joins the worker thread, so keep it off the event loop
+        await asyncio.to_thread(twitter_service.stop_streaming)
         streaming_status['active'] = False
-        streaming_status['stopped_at'] = datetime.now().isoformat()
+        streaming_status['stopped_at'] = _now_iso()
         
         return {
             "message": "Streaming stopped successfully",
@@ -265,10 +615,14 @@ async def stop_streaming():
         raise HTTPException(status_code=500, detail=f"Failed to stop streaming: {str(e)}")
 
 @app.get("/streaming/status")
-async def get_streaming_status():
+async def get_streaming_status(request: Request, response: Response):
     """Get current streaming status"""
     global streaming_status, twitter_service
     
+    not_modified = await _conditional_response(request, response)
+    if not_modified:
+        return not_modified
+    
     status = streaming_status.copy()
     
     if twitter_service:
@@ -278,17 +632,20 @@ async def get_streaming_status():
 
 # Live tweets endpoint
 @app.get("/tweets/live")
-async def get_live_tweets(limit: int = 50):
+async def get_live_tweets(request: Request, response: Response, limit: int = 50):
     """Get recent live disaster tweets"""
-    global live_tweets
+    not_modified = await _conditional_response(request, response)
+    if not_modified:
+        return not_modified
     
     # Return most recent tweets, limited by the specified amount
-    recent_tweets = live_tweets[-limit:] if live_tweets else []
+    live_feed = await _live_tweets_snapshot()
+    recent_tweets = live_feed[-limit:] if live_feed else []
     
     return {
         "tweets": recent_tweets,
         "count": len(recent_tweets),
-        "total_cached": len(tweet_cache),
+        "total_cached": await _cache_size(),
         "last_update": streaming_status.get('last_update'),
         "streaming_active": streaming_status.get('active', False)
     }
@@ -307,85 +664,86 @@ async def search_tweets(
         raise HTTPException(status_code=503, detail="Twitter service not available")
     
     try:
-        tweets = twitter_service.search_tweets(query=query, max_results=max_results)
+        tweets = await asyncio.to_thread(
+            twitter_service.search_tweets, query=query, max_results=max_results
+        )
         
         if disaster_only:
             tweets = [t for t in tweets if t['is_disaster']]
         
-        # Sort by priority score
-        tweets.sort(key=lambda x: x['priority_score'], reverse=True)
+        # Rank by priority score, keeping at most max_results tweets
+        tweets = nlargest(max_results, tweets, key=lambda x: x['priority_score'])
         
-        return {
-            "tweets": tweets,
+        return _stream_tweets_response(tweets, {
             "count": len(tweets),
             "query": query,
             "disaster_only": disaster_only,
-            "searched_at": datetime.now().isoformat()
-        }
+            "searched_at": _now_iso()
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 # Top priority tweets (enhanced)
 @app.get("/top_priority")
-async def get_top_priority_tweets(limit: int = 10, source: str = "all"):
+async def get_top_priority_tweets(request: Request, response: Response,
+                                  limit: int = 10, source: str = "all"):
     """Get top priority disaster tweets from various sources"""
-    global live_tweets, tweet_cache
+    not_modified = await _conditional_response(request, response)
+    if not_modified:
+        return not_modified
     
-    all_tweets = []
+    # Keep disaster tweets only, deduplicated by tweet ID (live copies win)
+    disaster_tweets = {}
+    total_available = 0
     
     if source in ["all", "live"]:
-        all_tweets.extend(live_tweets)
+        for tweet in await _live_tweets_snapshot():
+            if tweet.get('is_disaster', False):
+                disaster_tweets.setdefault(tweet['id'], tweet)
+        total_available = len(disaster_tweets)
     
     if source in ["all", "cache"]:
-        all_tweets.extend(list(tweet_cache.values()))
-    
-    # Remove duplicates based on tweet ID
-    seen_ids = set()
-    unique_tweets = []
-    for tweet in all_tweets:
-        if tweet['id'] not in seen_ids:
-            unique_tweets.append(tweet)
-            seen_ids.add(tweet['id'])
-    
-    # Filter for disaster tweets only
-    disaster_tweets = [t for t in unique_tweets if t.get('is_disaster', False)]
+        cached, cached_unseen = await _cached_disaster_tweets(limit, disaster_tweets.keys())
+        for tweet in cached:
+            disaster_tweets.setdefault(tweet['id'], tweet)
+        total_available += cached_unseen
     
-    # Sort by priority score
-    disaster_tweets.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+    # Select the highest priority tweets without sorting the whole set
+    top_tweets = nlargest(limit, disaster_tweets.values(), key=lambda x: x.get('priority_score', 0))
     
-    return {
-        "tweets": disaster_tweets[:limit],
-        "total_available": len(disaster_tweets),
+    return _stream_tweets_response(top_tweets, {
+        "total_available": total_available,
         "source": source,
-        "retrieved_at": datetime.now().isoformat()
-    }
+        "retrieved_at": _now_iso()
+    }, headers=dict(response.headers))
 
 # Statistics endpoint
 @app.get("/stats")
-async def get_system_stats():
+async def get_system_stats(request: Request, response: Response):
     """Get comprehensive system statistics"""
-    global live_tweets, tweet_cache, streaming_status, twitter_service
+    global streaming_status, twitter_service
+    
+    not_modified = await _conditional_response(request, response)
+    if not_modified:
+        return not_modified
     
-    # Calculate statistics
-    total_tweets = len(tweet_cache)
-    disaster_tweets = len([t for t in tweet_cache.values() if t.get('is_disaster', False)])
+    # Calculate statistics from the running counters
+    counters = await _cache_counters()
+    total_tweets = await _cache_size()
+    disaster_tweets = counters["disaster"]
     
     # Recent activity (last hour)
-    one_hour_ago = datetime.now() - timedelta(hours=1)
-    recent_tweets = [
-        t for t in tweet_cache.values() 
-        if 'processed_at' in t and datetime.fromisoformat(t['processed_at']) > one_hour_ago
-    ]
+    recent_count, recent_disaster = await _recent_activity_counts(time.time())
     
     stats = {
         "total_processed_tweets": total_tweets,
         "disaster_tweets": disaster_tweets,
-        "normal_tweets": total_tweets - disaster_tweets,
-        "live_tweets_count": len(live_tweets),
+        "normal_tweets": counters["normal"],
+        "live_tweets_count": await _live_size(),
         "recent_activity": {
-            "last_hour": len(recent_tweets),
-            "disaster_rate": len([t for t in recent_tweets if t.get('is_disaster', False)]) / max(len(recent_tweets), 1)
+            "last_hour": recent_count,
+            "disaster_rate": recent_disaster / max(recent_count, 1)
         },
         "streaming": streaming_status,
         "system": {
@@ -401,6 +759,23 @@ async def get_system_stats():
     
     return stats
 
+@app.post("/admin/cache_clear")
+async def clear_prediction_caches():
+    """Invalidate memoized classifications and location lookups"""
+    cleared_classifications = twitter_service.clear_classification_cache() if twitter_service else 0
+    location_info = _lookup_known_location.cache_info()
+    
+    _lookup_known_location.cache_clear()
+    
+    return {
+        "message": "Prediction caches cleared",
+        "cleared": {
+            "classifications": cleared_classifications,
+            "locations": location_info.currsize
+        },
+        "cleared_at": _now_iso()
+    }
+
 # Manual tweet ingestion for testing
 @app.post("/tweets/ingest")
 async def ingest_test_tweets(count: int = 10):
@@ -412,18 +787,18 @@ async def ingest_test_tweets(count: int = 10):
     
     try:
         # Generate test tweets
-        tweets = twitter_service.search_tweets(max_results=count)
+        tweets = await asyncio.to_thread(twitter_service.search_tweets, max_results=count)
         
         # Process them as if they came from streaming
         disaster_tweets = [t for t in tweets if t['is_disaster']]
         
         if disaster_tweets:
-            handle_new_tweets(disaster_tweets)
+            await _apply_batch(disaster_tweets)
         
         return {
             "message": f"Ingested {len(disaster_tweets)} disaster tweets out of {len(tweets)} total",
             "disaster_tweets": disaster_tweets,
-            "ingested_at": datetime.now().isoformat()
+            "ingested_at": _now_iso()
         }
         
     except Exception as e:
@@ -435,11 +810,17 @@ if __name__ == "__main__":
     print("🌐 Access: http://localhost:8002")
     print("📚 Docs: http://localhost:8002/docs")
     
+    # Set REDIS_URL before raising WORKERS so every worker shares tweet state.
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard]) and falls
+    # back to asyncio/h11 otherwise, e.g. on Windows
     uvicorn.run(
-        app,
+        "enhanced_realtime_server:app",
         host="0.0.0.0",
         port=8002,
         reload=False,
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="auto",
+        http="auto",
         log_level="info"
     )
 
@@ -1,22 +1,30 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
-import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
-import json
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from api_responses import ORJSONResponse
 
 # Import our real Twitter integration service
-from real_twitter_integration import RealTwitterIntegrationService, TwitterConfig
+from real_twitter_integration import RealTwitterIntegrationService, TwitterConfig, _geocode_cached
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, streaming fetches then use requests in a thread
+    aiohttp = None
 
 app = FastAPI(
     title="Real-Time Disaster Tweet Triage API",
     description="Advanced disaster monitoring system with real Twitter API integration",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -28,10 +36,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _priority_bucket(priority_score: float) -> int:
+    """Index into TweetCacheStore.bucket_counts for a priority score"""
+    if priority_score < 0.5:
+        return 0
+    if priority_score < 0.7:
+        return 1
+    if priority_score < 0.9:
+        return 2
+    return 3
+
+class TweetCacheStore:
+    """
+    Fixed-size FIFO cache of recent tweets with a priority index.
+    Disaster tweets are kept sorted by priority score (highest first, oldest
+    first on ties) so top-k reads avoid scanning the cache; per-bucket counts are kept running.
+    """
+    
+    def __init__(self, max_size: int = 100):
+        self.max_size = max_size
+        self._entries = deque()  # (seq, tweet), oldest first
+        self._priority_index = []  # sorted (-priority_score, seq, tweet), disaster only
+        self._next_seq = 0
+        self.bucket_counts = [0] * 4  # low, medium, high, critical disaster tweets
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def disaster_count(self) -> int:
+        return len(self._priority_index)
+    
+    def add(self, tweet: Dict):
+        """Add a tweet, evicting the oldest once the cache is full"""
+        seq = self._next_seq
+        self._next_seq += 1
+        
+        self._entries.append((seq, tweet))
+        if tweet.get('is_disaster', False):
+            priority_score = tweet.get('priority_score', 0)
+            insort(self._priority_index, (-priority_score, seq, tweet))
+            self.bucket_counts[_priority_bucket(priority_score)] += 1
+        
+        while len(self._entries) > self.max_size:
+            self._evict_oldest()
+    
+    def extend(self, tweets: List[Dict]):
+        # Tweets beyond the last max_size would be evicted within this call anyway
+        for tweet in tweets[-self.max_size:]:
+            self.add(tweet)
+    
+    def _evict_oldest(self):
+        seq, tweet = self._entries.popleft()
+        if tweet.get('is_disaster', False):
+            priority_score = tweet.get('priority_score', 0)
+            index = bisect_left(self._priority_index, (-priority_score, seq))
+            del self._priority_index[index]
+            self.bucket_counts[_priority_bucket(priority_score)] -= 1
+    
+    def count_at_least(self, min_priority: float) -> int:
+        """Number of disaster tweets with priority_score >= min_priority"""
+        return bisect_right(self._priority_index, (-min_priority, float('inf')))
+    
+    def top_k(self, k: int, min_priority: float = 0.0) -> List[Dict]:
+        """Highest priority disaster tweets scoring at least min_priority"""
+        matches = self._priority_index[:self.count_at_least(min_priority)]
+        return [tweet for _, _, tweet in matches[:k]]
+    
+    def priority_distribution(self) -> Dict[str, int]:
+        """Disaster tweet counts per priority bucket"""
+        low, medium, high, critical = self.bucket_counts
+        return {
+            'critical': critical,
+            'high': high,
+            'medium': medium,
+            'low': low
+        }
+
 # Global variables
 twitter_service = None
-tweet_cache = []
+tweet_cache = TweetCacheStore(max_size=100)
 streaming_active = False
+stream_task = None  # asyncio task running _streaming_loop
+# Serializes /api/configure so concurrent calls can't interleave the service swap
+service_lock = asyncio.Lock()
+http_session = None  # shared aiohttp session for Twitter API fetches
+# Thread pool for CPU-bound classification so the event loop stays responsive
+MODEL_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Micro-batching of concurrent /predict calls into one classify_many call
+PREDICT_BATCH_MAX_SIZE = 64
+PREDICT_BATCH_MAX_WAIT = 0.005  # seconds to wait for more requests to join a batch
+predict_queue = None
+predict_batch_task = None
+
+# Canned texts classified at startup so the first real request doesn't pay warmup costs
+WARMUP_TEXTS = ['earthquake', 'sunny day', 'fire evacuate']
+
 streaming_config = {
     "enabled": False,
     "interval": 30,
@@ -76,28 +177,130 @@ def initialize_twitter_service():
     )
     
     twitter_service = RealTwitterIntegrationService(config)
+    
+    # Warm up the priority kernels so JIT compilation doesn't hit the first request
+    twitter_service._calculate_priority_score("", None, 0.0, False)
+    twitter_service._calculate_priority_scores_vec([""], [None], [0.0], [False])
     print("✅ Twitter integration service initialized")
 
 def handle_new_tweets(tweets: List[Dict]):
     """Handle new tweets from streaming"""
-    global tweet_cache, streaming_config
-    
-    # Add to cache
-    tweet_cache.extend(tweets)
+    global streaming_config
+    cache = tweet_cache
     
-    # Keep only last 100 tweets
-    tweet_cache = tweet_cache[-100:]
+    # Add to cache (the store keeps only the last 100 tweets)
+    cache.extend(tweets)
     
     # Update streaming stats
     streaming_config["last_update"] = datetime.now().isoformat()
     streaming_config["total_processed"] += len(tweets)
     
-    print(f"📡 Processed {len(tweets)} new disaster tweets (Total cached: {len(tweet_cache)})")
+    print(f"📡 Processed {len(tweets)} new disaster tweets (Total cached: {len(cache)})")
+
+async def _streaming_loop(service: RealTwitterIntegrationService, interval: int):
+    """Feed streamed tweet batches into the cache on the event loop"""
+    async for tweets in service.stream_iter(http_session, interval):
+        handle_new_tweets(tweets)
+
+async def _cancel_stream_task():
+    """Cancel the streaming task, if any, and wait for it to unwind"""
+    global stream_task
+    
+    task, stream_task = stream_task, None
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+def _drain_predict_queue(items: List):
+    """Move queued /predict requests into items without waiting"""
+    while len(items) < PREDICT_BATCH_MAX_SIZE:
+        try:
+            items.append(predict_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+async def _predict_batch_worker():
+    """Coalesce concurrent /predict requests into batched classifications"""
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        items = [await predict_queue.get()]
+        _drain_predict_queue(items)
+        if len(items) < PREDICT_BATCH_MAX_SIZE:
+            # Give concurrent requests a moment to join this batch
+            await asyncio.sleep(PREDICT_BATCH_MAX_WAIT)
+            _drain_predict_queue(items)
+        
+        # Each request is classified by the service it was validated against, so a
+        # concurrent /api/configure never mixes two models in one response
+        groups = {}
+        for service, text, future in items:
+            groups.setdefault(service, []).append((text, future))
+        
+        for service, group in groups.items():
+            texts = [text for text, _ in group]
+            try:
+                classifications = await loop.run_in_executor(
+                    MODEL_POOL, service.classify_many, texts
+                )
+            except Exception as e:
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), classification in zip(group, classifications):
+                if not future.done():
+                    future.set_result(classification)
+
+async def _classify_coalesced(service: RealTwitterIntegrationService, text: str) -> Dict:
+    """Queue a text for the micro-batcher and wait for its classification by service"""
+    future = asyncio.get_running_loop().create_future()
+    await predict_queue.put((service, text, future))
+    return await future
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    global predict_queue, predict_batch_task, http_session
+    
     initialize_twitter_service()
+    
+    # Fault the model arrays in and compile any JIT kernels before traffic arrives
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(MODEL_POOL, twitter_service.classify_many, WARMUP_TEXTS)
+    print("🔥 Classifier warmed up")
+    
+    predict_queue = asyncio.Queue()
+    predict_batch_task = asyncio.create_task(_predict_batch_worker())
+    
+    if aiohttp is not None:
+        http_session = aiohttp.ClientSession()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop streaming and the micro-batcher, and release the shared HTTP connections"""
+    global http_session, predict_batch_task
+    
+    await _cancel_stream_task()
+    
+    task, predict_batch_task = predict_batch_task, None
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    if twitter_service:
+        twitter_service.close()
+    
+    if http_session:
+        await http_session.close()
+        http_session = None
 
 @app.get("/")
 async def root():
@@ -124,13 +327,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Comprehensive health check"""
-    global twitter_service, streaming_config
+    global streaming_config
+    service = twitter_service
+    cache = tweet_cache
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
-    status = twitter_service.get_stream_status()
-    usage = twitter_service.get_usage_stats()
+    status = service.get_stream_status()
+    usage = service.get_usage_stats()
     
     return {
         "status": "healthy",
@@ -149,74 +354,62 @@ async def health_check():
             "interval": streaming_config["interval"]
         },
         "cache": {
-            "tweets_cached": len(tweet_cache),
-            "disaster_tweets": len([t for t in tweet_cache if t.get('is_disaster', False)])
+            "tweets_cached": len(cache),
+            "disaster_tweets": cache.disaster_count
         },
         "api_usage": usage
     }
 
-@app.post("/predict")
-async def predict_tweet(request: TweetPredictionRequest):
-    """Predict if a single tweet is disaster-related"""
-    global twitter_service
-    
-    if not twitter_service:
-        raise HTTPException(status_code=503, detail="Twitter service not initialized")
-    
-    # Classify the tweet
-    classification = twitter_service.classify_tweet(request.text)
+def _predict_sync(service: RealTwitterIntegrationService, text: str, location: Optional[str],
+                  classification: Optional[Dict] = None) -> Dict:
+    """Classify and score a single tweet"""
+    # Classify the tweet unless the micro-batcher already did
+    if classification is None:
+        classification = service.classify_tweet(text)
     
     # Get coordinates if location provided
     coordinates = None
-    if request.location:
-        coordinates = twitter_service._get_coordinates_from_text(request.location)
+    if location:
+        coordinates = service._get_coordinates_from_text(location)
     
     # Calculate priority score
-    priority_score = twitter_service._calculate_priority_score(
-        request.text,
-        request.location,
+    priority_score = service._calculate_priority_score(
+        text,
+        location,
         classification['confidence'],
         coordinates is not None
     )
     
     return {
-        "text": request.text,
-        "location": request.location,
+        "text": text,
+        "location": location,
         "coordinates": coordinates,
         "is_disaster": classification['is_disaster'],
         "confidence": classification['confidence'],
         "priority_score": priority_score,
-        "classification_method": classification['method'],
-        "timestamp": datetime.now().isoformat()
+        "classification_method": classification['method']
     }
 
-@app.post("/predict_batch")
-async def predict_batch(request: BatchTweetRequest):
-    """Predict multiple tweets at once"""
-    global twitter_service
-    
-    if not twitter_service:
-        raise HTTPException(status_code=503, detail="Twitter service not initialized")
+def _predict_batch_sync(service: RealTwitterIntegrationService,
+                        tweets: List[TweetPredictionRequest]) -> List[Dict]:
+    """Classify and score a batch of tweets (CPU-bound, runs on MODEL_POOL)"""
+    # Classify the whole batch with a single vectorized call
+    classifications = service.classify_many([t.text for t in tweets])
+    # Coordinates for every provided location, numeric ones parsed in one pass
+    coordinates_list = service._get_coordinates_many([t.location for t in tweets])
+    # Priority scores for the whole batch in one vectorized pass
+    priority_scores = service._calculate_priority_scores_vec(
+        [t.text for t in tweets],
+        [t.location for t in tweets],
+        [c['confidence'] for c in classifications],
+        [coordinates is not None for coordinates in coordinates_list]
+    ).tolist()
     
     results = []
-    for tweet_req in request.tweets:
-        # Classify the tweet
-        classification = twitter_service.classify_tweet(tweet_req.text)
-        
-        # Get coordinates if location provided
-        coordinates = None
-        if tweet_req.location:
-            coordinates = twitter_service._get_coordinates_from_text(tweet_req.location)
-        
-        # Calculate priority score
-        priority_score = twitter_service._calculate_priority_score(
-            tweet_req.text,
-            tweet_req.location,
-            classification['confidence'],
-            coordinates is not None
-        )
-        
-        results.append({
+    append = results.append
+    for tweet_req, classification, coordinates, priority_score in zip(
+            tweets, classifications, coordinates_list, priority_scores):
+        append({
             "text": tweet_req.text,
             "location": tweet_req.location,
             "coordinates": coordinates,
@@ -226,6 +419,36 @@ async def predict_batch(request: BatchTweetRequest):
             "classification_method": classification['method']
         })
     
+    return results
+
+@app.post("/predict")
+async def predict_tweet(request: TweetPredictionRequest):
+    """Predict if a single tweet is disaster-related"""
+    service = twitter_service
+    
+    if not service:
+        raise HTTPException(status_code=503, detail="Twitter service not initialized")
+    
+    # Classification is batched with concurrent requests; scoring is cheap
+    classification = await _classify_coalesced(service, request.text)
+    result = _predict_sync(service, request.text, request.location, classification)
+    result["timestamp"] = datetime.now().isoformat()
+    
+    return result
+
+@app.post("/predict_batch")
+async def predict_batch(request: BatchTweetRequest):
+    """Predict multiple tweets at once"""
+    service = twitter_service
+    
+    if not service:
+        raise HTTPException(status_code=503, detail="Twitter service not initialized")
+    
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(
+        MODEL_POOL, _predict_batch_sync, service, request.tweets
+    )
+    
     return {
         "results": results,
         "total_processed": len(results),
@@ -236,25 +459,16 @@ async def predict_batch(request: BatchTweetRequest):
 @app.get("/tweets/live")
 async def get_live_tweets(limit: int = 50, min_priority: float = 0.0):
     """Get live disaster tweets from cache"""
-    global tweet_cache
-    
-    # Filter by priority and disaster classification
-    filtered_tweets = [
-        tweet for tweet in tweet_cache 
-        if tweet.get('is_disaster', False) and tweet.get('priority_score', 0) >= min_priority
-    ]
-    
-    # Sort by priority score (highest first)
-    filtered_tweets.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+    cache = tweet_cache
     
-    # Limit results
-    limited_tweets = filtered_tweets[:limit]
+    # Disaster tweets above min_priority, highest priority first
+    limited_tweets = cache.top_k(limit, min_priority)
     
     return {
         "tweets": limited_tweets,
-        "total_available": len(filtered_tweets),
+        "total_available": cache.count_at_least(min_priority),
         "returned": len(limited_tweets),
-        "cache_size": len(tweet_cache),
+        "cache_size": len(cache),
         "last_update": streaming_config.get("last_update"),
         "timestamp": datetime.now().isoformat()
     }
@@ -262,13 +476,14 @@ async def get_live_tweets(limit: int = 50, min_priority: float = 0.0):
 @app.get("/tweets/search")
 async def search_tweets(query: str, max_results: int = 50):
     """Search for tweets using the Twitter API"""
-    global twitter_service
+    service = twitter_service
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
     try:
-        tweets = twitter_service.search_tweets(query, max_results)
+        # Network-bound: aiohttp or a worker thread, keeping MODEL_POOL free for inference
+        tweets = await service.search_tweets_async(http_session, query, max_results)
         
         # Filter for disaster tweets only
         disaster_tweets = [t for t in tweets if t.get('is_disaster', False)]
@@ -278,7 +493,7 @@ async def search_tweets(query: str, max_results: int = 50):
             "tweets": disaster_tweets,
             "total_found": len(tweets),
             "disaster_tweets": len(disaster_tweets),
-            "api_mode": "simulation" if twitter_service.config.simulation_mode else "real_api",
+            "api_mode": "simulation" if service.config.simulation_mode else "real_api",
             "timestamp": datetime.now().isoformat()
         }
         
@@ -288,72 +503,72 @@ async def search_tweets(query: str, max_results: int = 50):
 @app.get("/top_priority")
 async def get_top_priority_tweets(limit: int = 10):
     """Get the highest priority disaster tweets"""
-    global tweet_cache
-    
-    # Filter for disaster tweets only
-    disaster_tweets = [t for t in tweet_cache if t.get('is_disaster', False)]
+    cache = tweet_cache
     
-    # Sort by priority score (highest first)
-    disaster_tweets.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
-    
-    # Get top N
-    top_tweets = disaster_tweets[:limit]
+    # Get top N disaster tweets (highest priority first)
+    top_tweets = cache.top_k(limit, float('-inf'))
     
     return {
         "top_priority_tweets": top_tweets,
         "returned": len(top_tweets),
-        "total_disaster_tweets": len(disaster_tweets),
+        "total_disaster_tweets": cache.disaster_count,
         "timestamp": datetime.now().isoformat()
     }
 
 @app.post("/streaming/start")
 async def start_streaming(config: StreamingConfigRequest):
     """Start real-time tweet streaming"""
-    global twitter_service, streaming_active, streaming_config
+    global streaming_active, streaming_config, stream_task
+    service = twitter_service
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
-    if streaming_active:
-        return {"message": "Streaming already active", "config": streaming_config}
-    
-    # Update configuration
-    streaming_config.update({
-        "enabled": config.enabled,
-        "interval": config.interval or 30,
-        "last_update": None,
-        "total_processed": 0
-    })
-    
-    if config.enabled:
-        # Start streaming
-        twitter_service.start_streaming(handle_new_tweets, config.interval or 30)
-        streaming_active = True
+    async with service_lock:
+        if streaming_active:
+            return {"message": "Streaming already active", "config": streaming_config}
         
-        return {
-            "message": "Streaming started successfully",
-            "config": streaming_config,
-            "api_mode": "simulation" if twitter_service.config.simulation_mode else "real_api",
-            "timestamp": datetime.now().isoformat()
-        }
-    else:
-        return {"message": "Streaming disabled in configuration"}
+        # Update configuration
+        streaming_config.update({
+            "enabled": config.enabled,
+            "interval": config.interval or 30,
+            "last_update": None,
+            "total_processed": 0
+        })
+        
+        if not config.enabled:
+            return {"message": "Streaming disabled in configuration"}
+        
+        # Start streaming on the current service, which /api/configure may have replaced
+        service = twitter_service
+        stream_task = asyncio.create_task(_streaming_loop(service, config.interval or 30))
+        streaming_active = True
+    
+    return {
+        "message": "Streaming started successfully",
+        "config": streaming_config,
+        "api_mode": "simulation" if service.config.simulation_mode else "real_api",
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.post("/streaming/stop")
 async def stop_streaming():
     """Stop real-time tweet streaming"""
-    global twitter_service, streaming_active, streaming_config
+    global streaming_active, streaming_config
+    service = twitter_service
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
-    if not streaming_active:
-        return {"message": "Streaming not active"}
-    
-    # Stop streaming
-    twitter_service.stop_streaming()
-    streaming_active = False
-    streaming_config["enabled"] = False
+    async with service_lock:
+        if not streaming_active:
+            return {"message": "Streaming not active"}
+        
+        # Stop streaming
+        await _cancel_stream_task()
+        twitter_service.stop_streaming()
+        streaming_active = False
+        streaming_config["enabled"] = False
     
     return {
         "message": "Streaming stopped successfully",
@@ -368,19 +583,21 @@ async def stop_streaming():
 @app.get("/streaming/status")
 async def get_streaming_status():
     """Get current streaming status"""
-    global twitter_service, streaming_config
+    global streaming_config
+    service = twitter_service
+    cache = tweet_cache
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
-    status = twitter_service.get_stream_status()
+    status = service.get_stream_status()
     
     return {
         "streaming": streaming_config,
         "service_status": status,
         "cache_info": {
-            "total_tweets": len(tweet_cache),
-            "disaster_tweets": len([t for t in tweet_cache if t.get('is_disaster', False)])
+            "total_tweets": len(cache),
+            "disaster_tweets": cache.disaster_count
         },
         "timestamp": datetime.now().isoformat()
     }
@@ -388,7 +605,7 @@ async def get_streaming_status():
 @app.post("/api/configure")
 async def configure_twitter_api(config: TwitterAPIConfigRequest):
     """Configure Twitter API credentials"""
-    global twitter_service
+    global twitter_service, streaming_active, streaming_config
     
     try:
         # Create new configuration
@@ -402,12 +619,26 @@ async def configure_twitter_api(config: TwitterAPIConfigRequest):
             simulation_mode=not (config.api_key or config.bearer_token)
         )
         
-        # Stop current streaming if active
-        if twitter_service and streaming_active:
-            twitter_service.stop_streaming()
-        
-        # Initialize new service
-        twitter_service = RealTwitterIntegrationService(new_config)
+        async with service_lock:
+            # Stop current streaming if active
+            if streaming_active:
+                await _cancel_stream_task()
+                twitter_service.stop_streaming()
+                streaming_active = False
+                streaming_config["enabled"] = False
+            
+            # Initialize new service off the event loop (the official client verifies
+            # credentials over the network) and load its model before swapping it in;
+            # requests already in flight keep their reference to the old one
+            new_service = await asyncio.to_thread(RealTwitterIntegrationService, new_config)
+            await asyncio.get_running_loop().run_in_executor(
+                MODEL_POOL, new_service.classify_many, WARMUP_TEXTS
+            )
+            old_service, twitter_service = twitter_service, new_service
+            # Release the old service's pooled connections; later calls on a stale
+            # reference fall back to plain requests
+            if old_service:
+                old_service.close()
         
         return {
             "message": "Twitter API configured successfully",
@@ -423,34 +654,26 @@ async def configure_twitter_api(config: TwitterAPIConfigRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Configuration failed: {str(e)}")
 
-@app.post("/tweets/ingest")
-async def ingest_tweets(tweets: List[Dict]):
-    """Manually ingest tweets for processing"""
-    global tweet_cache
-    
+def _process_ingested_sync(service: RealTwitterIntegrationService, tweets: List[Dict]) -> List[Dict]:
+    """Classify and score manually ingested tweets (CPU-bound, runs on MODEL_POOL)"""
     processed_tweets = []
     
-    for tweet_data in tweets:
-        # Ensure required fields
-        if 'text' not in tweet_data:
-            continue
-        
-        # Classify the tweet
-        classification = twitter_service.classify_tweet(tweet_data['text'])
-        
-        # Get coordinates if location provided
-        coordinates = None
+    # Ensure required fields, then classify all tweets in one call
+    tweets = [tweet_data for tweet_data in tweets if 'text' in tweet_data]
+    classifications = service.classify_many([t['text'] for t in tweets])
+    # Coordinates for every provided location, numeric ones parsed in one pass
+    coordinates_list = service._get_coordinates_many([t.get('location') for t in tweets])
+    # Priority scores for the whole batch in one vectorized pass
+    priority_scores = service._calculate_priority_scores_vec(
+        [t['text'] for t in tweets],
+        [t.get('location') for t in tweets],
+        [c['confidence'] for c in classifications],
+        [coordinates is not None for coordinates in coordinates_list]
+    ).tolist()
+    
+    for tweet_data, classification, coordinates, priority_score in zip(
+            tweets, classifications, coordinates_list, priority_scores):
         location = tweet_data.get('location')
-        if location:
-            coordinates = twitter_service._get_coordinates_from_text(location)
-        
-        # Calculate priority score
-        priority_score = twitter_service._calculate_priority_score(
-            tweet_data['text'],
-            location,
-            classification['confidence'],
-            coordinates is not None
-        )
         
         processed_tweet = {
             'id': tweet_data.get('id', f"manual_{int(time.time())}"),
@@ -469,9 +692,20 @@ async def ingest_tweets(tweets: List[Dict]):
         
         processed_tweets.append(processed_tweet)
     
-    # Add to cache
-    tweet_cache.extend(processed_tweets)
-    tweet_cache = tweet_cache[-100:]  # Keep last 100
+    return processed_tweets
+
+@app.post("/tweets/ingest")
+async def ingest_tweets(tweets: List[Dict]):
+    """Manually ingest tweets for processing"""
+    cache = tweet_cache
+    
+    loop = asyncio.get_running_loop()
+    processed_tweets = await loop.run_in_executor(
+        MODEL_POOL, _process_ingested_sync, twitter_service, tweets
+    )
+    
+    # Add to cache (the store keeps only the last 100 tweets)
+    cache.extend(processed_tweets)
     
     return {
         "message": f"Ingested {len(processed_tweets)} tweets",
@@ -483,23 +717,19 @@ async def ingest_tweets(tweets: List[Dict]):
 @app.get("/stats")
 async def get_system_stats():
     """Get comprehensive system statistics"""
-    global twitter_service, tweet_cache, streaming_config
+    global streaming_config
+    service = twitter_service
+    cache = tweet_cache
     
-    if not twitter_service:
+    if not service:
         raise HTTPException(status_code=503, detail="Twitter service not initialized")
     
     # Calculate cache statistics
-    disaster_tweets = [t for t in tweet_cache if t.get('is_disaster', False)]
-    priority_distribution = {
-        'critical': len([t for t in disaster_tweets if t.get('priority_score', 0) >= 0.9]),
-        'high': len([t for t in disaster_tweets if 0.7 <= t.get('priority_score', 0) < 0.9]),
-        'medium': len([t for t in disaster_tweets if 0.5 <= t.get('priority_score', 0) < 0.7]),
-        'low': len([t for t in disaster_tweets if t.get('priority_score', 0) < 0.5])
-    }
+    priority_distribution = cache.priority_distribution()
     
     # Get API usage stats
-    usage_stats = twitter_service.get_usage_stats()
-    service_status = twitter_service.get_stream_status()
+    usage_stats = service.get_usage_stats()
+    service_status = service.get_stream_status()
     
     return {
         "system": {
@@ -515,8 +745,8 @@ async def get_system_stats():
         },
         "streaming": streaming_config,
         "cache": {
-            "total_tweets": len(tweet_cache),
-            "disaster_tweets": len(disaster_tweets),
+            "total_tweets": len(cache),
+            "disaster_tweets": cache.disaster_count,
             "priority_distribution": priority_distribution
         },
         "usage": usage_stats,
@@ -527,12 +757,27 @@ async def get_system_stats():
         }
     }
 
+@app.post("/admin/cache_clear")
+async def clear_geocode_cache():
+    """Invalidate memoized location-to-coordinate lookups"""
+    geocode_info = _geocode_cached.cache_info()
+    _geocode_cached.cache_clear()
+    
+    return {
+        "message": "Geocoding cache cleared",
+        "cleared": {
+            "locations": geocode_info.currsize
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     
     print("🚀 Starting Real-Time Disaster Tweet Triage API with Twitter Integration...")
     print("📡 Supports: Official Twitter API v2, TwitterAPI.io, and Simulation mode")
     print("🔧 Configure via environment variables or /api/configure endpoint")
+    print("🔥 Classifier and priority kernel are warmed up during startup")
     print("📖 API Documentation: http://localhost:8003/docs")
     
     uvicorn.run(
@@ -1,11 +1,29 @@
-import pickle
+import os
+
+import joblib
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, f1_score
 import re
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, preprocess_texts then uses the regex path
+    njit = None
+
+from quantized_model import QUANTIZED_MODEL_PATH, weights_fingerprint
+
+# Optional int8 copy of the classifier weights, served by both Twitter services
+QUANTIZED_MAX_F1_DROP = 0.005
+
+# Cleanup patterns used by preprocess_text, compiled once at import
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+MENTION_HASHTAG_PATTERN = re.compile(r'@\w+|#\w+')
+
 def preprocess_text(text):
     """Preprocess text for ML model"""
     if pd.isna(text):
@@ -15,16 +33,153 @@ def preprocess_text(text):
     text = str(text).lower()
     
     # Remove URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = URL_PATTERN.sub('', text)
     
     # Remove user mentions and hashtags
-    text = re.sub(r'@\w+|#\w+', '', text)
+    text = MENTION_HASHTAG_PATTERN.sub('', text)
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Remove extra whitespace (str.split collapses runs and trims in one C pass)
+    text = ' '.join(text.split())
     
     return text
 
+if njit is not None:
+    @njit(cache=True)
+    def _is_space(c):
+        """ASCII code points matched by \\s"""
+        return c == 32 or (9 <= c <= 13) or (28 <= c <= 31)
+    
+    @njit(cache=True)
+    def _is_word(c):
+        """Lowercase ASCII code points matched by \\w"""
+        return (97 <= c <= 122) or (48 <= c <= 57) or c == 95
+    
+    @njit(cache=True)
+    def _clean_ascii_batch(buf, offsets):
+        """preprocess_text over ASCII texts packed into one uint8 buffer"""
+        out = np.empty(buf.shape[0], dtype=np.uint8)
+        out_offsets = np.empty(offsets.shape[0], dtype=np.int64)
+        scratch = np.empty(buf.shape[0], dtype=np.uint8)
+        out_offsets[0] = 0
+        pos = 0
+        
+        for row in range(offsets.shape[0] - 1):
+            start = offsets[row]
+            end = offsets[row + 1]
+            
+            # Lowercase, dropping http\S+ / www\S+ runs (URL_PATTERN)
+            for i in range(start, end):
+                c = buf[i]
+                scratch[i] = c + 32 if 65 <= c <= 90 else c
+            
+            n = start
+            i = start
+            while i < end:
+                c = scratch[i]
+                is_url = (
+                    c == 104 and i + 4 < end and scratch[i + 1] == 116 and scratch[i + 2] == 116
+                    and scratch[i + 3] == 112 and not _is_space(scratch[i + 4])
+                ) or (
+                    c == 119 and i + 3 < end and scratch[i + 1] == 119 and scratch[i + 2] == 119
+                    and not _is_space(scratch[i + 3])
+                )
+                if is_url:
+                    while i < end and not _is_space(scratch[i]):
+                        i += 1
+                    continue
+                scratch[n] = c
+                n += 1
+                i += 1
+            
+            # Drop @\w+ / #\w+ (MENTION_HASHTAG_PATTERN) and collapse whitespace
+            row_start = pos
+            pending_space = False
+            j = start
+            while j < n:
+                c = scratch[j]
+                if (c == 64 or c == 35) and j + 1 < n and _is_word(scratch[j + 1]):
+                    j += 1
+                    while j < n and _is_word(scratch[j]):
+                        j += 1
+                    continue
+                if _is_space(c):
+                    pending_space = True
+                else:
+                    if pending_space and pos > row_start:
+                        out[pos] = 32
+                        pos += 1
+                    pending_space = False
+                    out[pos] = c
+                    pos += 1
+                j += 1
+            
+            out_offsets[row + 1] = pos
+        
+        return out[:pos], out_offsets
+
+def preprocess_texts(texts):
+    """Preprocess a column of texts, same output as preprocess_text per row"""
+    texts = list(texts)
+    
+    if njit is None:
+        remove_urls = URL_PATTERN.sub
+        remove_mentions_hashtags = MENTION_HASHTAG_PATTERN.sub
+        
+        return [
+            ' '.join(remove_mentions_hashtags('', remove_urls('', text.lower())).split())
+            if isinstance(text, str) else preprocess_text(text)
+            for text in texts
+        ]
+    
+    # ASCII texts go through the compiled single-buffer pass; anything else
+    # (NaN, non-ASCII case folding and \w rules) keeps the regex path
+    cleaned = [None] * len(texts)
+    ascii_rows = [i for i, text in enumerate(texts) if isinstance(text, str) and text.isascii()]
+    ascii_texts = [texts[i] for i in ascii_rows]
+    
+    if ascii_texts:
+        offsets = np.zeros(len(ascii_texts) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in ascii_texts], out=offsets[1:])
+        buf = np.frombuffer(''.join(ascii_texts).encode('ascii'), dtype=np.uint8)
+        
+        out, out_offsets = _clean_ascii_batch(buf, offsets)
+        joined = out.tobytes().decode('ascii')
+        for k, i in enumerate(ascii_rows):
+            cleaned[i] = joined[out_offsets[k]:out_offsets[k + 1]]
+    
+    for i, text in enumerate(texts):
+        if cleaned[i] is None:
+            cleaned[i] = preprocess_text(text)
+    
+    return cleaned
+
+def quantize_model(model, X_test_vectorized, y_test, float_f1):
+    """Quantize LogisticRegression weights to int8 and save them if F1 holds up"""
+    coef = model.coef_[0]
+    scale = float(np.abs(coef).max() / 127) or 1.0
+    weights = np.round(coef / scale).astype(np.int8)
+    bias = float(model.intercept_[0])
+    
+    logits = (X_test_vectorized @ weights.astype(np.float32)) * scale + bias
+    y_pred = (logits >= 0).astype(int)
+    quantized_f1 = f1_score(y_test, y_pred)
+    
+    print(f"Int8 F1 Score: {quantized_f1:.4f} (float: {float_f1:.4f})")
+    
+    if float_f1 - quantized_f1 > QUANTIZED_MAX_F1_DROP:
+        print("⚠️ Int8 weights lose too much accuracy, not saving quantized model")
+        # A file from an earlier model would otherwise keep being served
+        if os.path.exists(QUANTIZED_MODEL_PATH):
+            os.remove(QUANTIZED_MODEL_PATH)
+        return False
+    
+    # Fingerprint of the float32 weights the services will load, so they can tell
+    # whether this int8 copy belongs to the model next to it
+    np.savez(QUANTIZED_MODEL_PATH, weights=weights, scale=scale, bias=bias, classes=model.classes_,
+             fingerprint=weights_fingerprint(coef))
+    print(f"✅ Int8 weights saved to {QUANTIZED_MODEL_PATH}")
+    return True
+
 def create_and_save_model():
     """Create and save the ML model with vectorizer"""
     print("Loading and preprocessing dataset...")
@@ -57,7 +212,7 @@ def create_and_save_model():
         df = pd.DataFrame(sample_data)
     
     # Preprocess the data
-    df['text_clean'] = df['text'].apply(preprocess_text)
+    df['text_clean'] = preprocess_texts(df['text'])
     df['target'] = (df['choose_one'] == 'Relevant').astype(int)
     
     # Remove empty texts
@@ -75,14 +230,19 @@ def create_and_save_model():
         X, y, test_size=0.2, random_state=42, stratify=y
     )
     
-    # Create and fit TF-IDF vectorizer
+    # Create and fit TF-IDF vectorizer: hashed token columns plus a fitted idf
+    # vector, so transform needs no vocabulary lookups
     print("Creating TF-IDF vectorizer...")
-    vectorizer = TfidfVectorizer(
-        max_features=10000,
-        stop_words='english',
-        ngram_range=(1, 2),
-        min_df=2,
-        max_df=0.95
+    vectorizer = make_pipeline(
+        HashingVectorizer(
+            n_features=2**18,
+            alternate_sign=False,
+            stop_words='english',
+            ngram_range=(1, 2),
+            norm=None,
+            dtype=np.float32
+        ),
+        TfidfTransformer()
     )
     
     X_train_vectorized = vectorizer.fit_transform(X_train)
@@ -107,23 +267,28 @@ def create_and_save_model():
     print("\nClassification Report:")
     print(classification_report(y_test, y_pred))
     
+    quantize_model(model, X_test_vectorized, y_test, f1)
+    
     # Save the model and vectorizer
     print("Saving model and vectorizer...")
-    with open('disaster_model.pkl', 'wb') as f:
-        pickle.dump(model, f)
-    
-    with open('tfidf_vectorizer.pkl', 'wb') as f:
-        pickle.dump(vectorizer, f)
+    # Hashed columns never seen in training keep exactly-zero weights, so the
+    # float32 coef_ is stored as a sparse matrix (the services densify on load)
+    model.coef_ = model.coef_.astype(np.float32, copy=False)
+    model.intercept_ = model.intercept_.astype(np.float32, copy=False)
+    model.sparsify()
+    # joblib stores coef_/idf_ as raw numpy buffers; the files stay readable by
+    # the services' loaders under their existing .pkl names (the hashing
+    # pipeline exposes the same transform() as the old TfidfVectorizer).
+    # Keep them uncompressed: the services load with mmap_mode='r'
+    joblib.dump(model, 'disaster_model.pkl', compress=0)
+    joblib.dump(vectorizer, 'tfidf_vectorizer.pkl', compress=0)
     
     print("✅ Model and vectorizer saved successfully!")
     
     # Test the saved model
     print("\nTesting saved model...")
-    with open('disaster_model.pkl', 'rb') as f:
-        loaded_model = pickle.load(f)
-    
-    with open('tfidf_vectorizer.pkl', 'rb') as f:
-        loaded_vectorizer = pickle.load(f)
+    loaded_model = joblib.load('disaster_model.pkl')
+    loaded_vectorizer = joblib.load('tfidf_vectorizer.pkl')
     
     # Test with sample texts
     test_texts = [
@@ -136,8 +301,11 @@ def create_and_save_model():
     for text in test_texts:
         text_clean = preprocess_text(text)
         text_vectorized = loaded_vectorizer.transform([text_clean])
-        prediction = loaded_model.predict(text_vectorized)[0]
-        confidence = max(loaded_model.predict_proba(text_vectorized)[0])
+        # predict() would recompute the same probabilities, so derive the class from them
+        probabilities = loaded_model.predict_proba(text_vectorized)[0]
+        class_idx = int(np.argmax(probabilities))
+        prediction = loaded_model.classes_[class_idx]
+        confidence = float(probabilities[class_idx])
         
         print(f"Text: {text[:50]}...")
         print(f"Prediction: {'Disaster' if prediction else 'Normal'} (confidence: {confidence:.3f})")
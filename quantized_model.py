@@ -0,0 +1,76 @@
+"""
+int8 copy of the LogisticRegression weights, shared by the Twitter services.
+
+fix_model_loading.quantize_model writes the file; load_quantized_model only
+accepts it when it was quantized from the float model it is served next to.
+"""
+import hashlib
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the SciPy path is used instead
+    njit = None
+
+QUANTIZED_MODEL_PATH = 'disaster_model_int8.npz'
+
+def weights_fingerprint(coef) -> str:
+    """Hash of a coefficient row as float32, tying an int8 file to its float model"""
+    return hashlib.blake2b(np.ascontiguousarray(coef, dtype=np.float32).tobytes()).hexdigest()
+
+if njit is not None:
+    @njit(cache=True)
+    def quantized_probabilities(data, indices, indptr, weights, scale, bias):
+        """Positive-class probabilities from a CSR TF-IDF batch and int8 weights"""
+        n_rows = indptr.shape[0] - 1
+        probabilities = np.empty(n_rows, dtype=np.float32)
+        for row in range(n_rows):
+            logit = np.float32(0.0)
+            for i in range(indptr[row], indptr[row + 1]):
+                logit += data[i] * weights[indices[i]]
+            probabilities[row] = 1.0 / (1.0 + np.exp(-(logit * scale + bias)))
+        return probabilities
+else:
+    def quantized_probabilities(data, indices, indptr, weights, scale, bias):
+        """Positive-class probabilities from a CSR TF-IDF batch and int8 weights"""
+        X = csr_matrix((data, indices, indptr), shape=(indptr.shape[0] - 1, weights.shape[0]))
+        logits = (X @ weights.astype(np.float32)) * scale + bias
+        return (1.0 / (1.0 + np.exp(-logits))).astype(np.float32)
+
+def load_quantized_model(model) -> Optional[Dict]:
+    """Load the int8 weights, or None if missing or not quantized from this model"""
+    if model is None or not os.path.exists(QUANTIZED_MODEL_PATH):
+        return None
+
+    with np.load(QUANTIZED_MODEL_PATH) as quantized:
+        coef = np.asarray(model.coef_)[0]
+        if ('fingerprint' not in quantized.files
+                or str(quantized['fingerprint']) != weights_fingerprint(coef)
+                or quantized['weights'].shape != coef.shape
+                or not np.array_equal(quantized['classes'], model.classes_)):
+            print("⚠️ Int8 weights don't match the loaded model, using predict_proba")
+            return None
+
+        print("✅ Loaded int8 classifier weights")
+        return {
+            'weights': quantized['weights'],
+            'scale': np.float32(quantized['scale']),
+            'bias': np.float32(quantized['bias']),
+            'classes': quantized['classes']
+        }
+
+def predict_quantized(quantized: Dict, X):
+    """(predictions, confidences) for a TF-IDF batch from loaded int8 weights"""
+    X = X.tocsr()
+    positive = quantized_probabilities(
+        X.data.astype(np.float32, copy=False), X.indices, X.indptr,
+        quantized['weights'], quantized['scale'], quantized['bias']
+    )
+    classes = quantized['classes']
+    predictions = np.where(positive >= 0.5, classes[1], classes[0])
+    confidences = np.maximum(positive, 1.0 - positive)
+    return predictions, confidences
@@ -1,14 +1,268 @@
 import requests
-import json
+import asyncio
 import time
-import random
 import threading
 import os
-from datetime import datetime, timedelta
+import re
+import hashlib
+import mmap
+from collections import OrderedDict
+from datetime import datetime
 from typing import List, Dict, Optional
-import pickle
-import tweepy
+from functools import cached_property, lru_cache
+import joblib
+import numpy as np
+from scipy.sparse import issparse
 from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from quantized_model import load_quantized_model, predict_quantized
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, async fetches then run requests in a thread
+    aiohttp = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, API payloads then parse with the stdlib
+    from json import loads as json_loads
+
+try:
+    import httpx
+except ImportError:  # httpx is optional, sync fetches then use a requests.Session
+    httpx = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the kernel then runs as plain Python
+    njit = None
+
+# Keyword groups that boost a tweet's priority score
+PRIORITY_URGENCY_KEYWORDS = ['urgent', 'emergency', 'help', 'breaking', 'critical', 'severe', 'major']
+PRIORITY_DISASTER_KEYWORDS = ['fire', 'earthquake', 'flood', 'tornado', 'hurricane', 'explosion']
+PRIORITY_ACTION_KEYWORDS = ['evacuation', 'rescue', 'emergency services', 'first responders']
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Case-insensitive alternation matching any keyword as a substring"""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+PRIORITY_URGENCY_RE = _keyword_pattern(PRIORITY_URGENCY_KEYWORDS)
+PRIORITY_DISASTER_RE = _keyword_pattern(PRIORITY_DISASTER_KEYWORDS)
+PRIORITY_ACTION_RE = _keyword_pattern(PRIORITY_ACTION_KEYWORDS)
+
+# Word tokens of lowercased text, matched against the disaster keyword set
+KEYWORD_TOKEN_RE = re.compile(r'[a-z]+')
+
+# Enhanced location mapping with coordinates
+LOCATION_COORDINATES = {
+    'san francisco': [37.7749, -122.4194],
+    'los angeles': [34.0522, -118.2437],
+    'new york': [40.7128, -74.0060],
+    'houston': [29.7604, -95.3698],
+    'chicago': [41.8781, -87.6298],
+    'miami': [25.7617, -80.1918],
+    'seattle': [47.6062, -122.3321],
+    'denver': [39.7392, -104.9903],
+    'atlanta': [33.7490, -84.3880],
+    'phoenix': [33.4484, -112.0740],
+    'philadelphia': [39.9526, -75.1652],
+    'dallas': [32.7767, -96.7970],
+    'boston': [42.3601, -71.0589],
+    'detroit': [42.3314, -83.0458],
+    'washington': [38.9072, -77.0369],
+    'las vegas': [36.1699, -115.1398],
+    'portland': [45.5152, -122.6784],
+    'nashville': [36.1627, -86.7816],
+    'memphis': [35.1495, -90.0490],
+    'louisville': [38.2527, -85.7585]
+}
+
+# Single alternation over the known city names; the dict order breaks ties
+# when a location mentions more than one city
+LOCATION_CITY_RE = re.compile('|'.join(map(re.escape, LOCATION_COORDINATES)))
+LOCATION_CITY_ORDER = {city: i for i, city in enumerate(LOCATION_COORDINATES)}
+
+# Known-city coordinates packed into one read-only (N, 2) array, rows in
+# LOCATION_CITY_ORDER; float64 so lookups return the exact mapped values
+LOCATION_CITY_COORDS = np.array(list(LOCATION_COORDINATES.values()), dtype=np.float64)
+LOCATION_CITY_COORDS.flags.writeable = False
+
+# Plain "lat, lon" location strings, parsed in bulk by _parse_coords_batch
+COORDINATE_TEXT_RE = re.compile(r'\s*-?\d+(?:\.\d*)?\s*,\s*-?\d+(?:\.\d*)?\s*')
+
+TWITTERAPI_IO_SEARCH_URL = "https://api.twitterapi.io/v2/tweets/search/recent"
+
+# Search field/expansion parameters shared by both APIs, pre-joined the way
+# they go on the wire (tweepy passes strings through unchanged)
+SEARCH_TWEET_FIELDS = 'created_at,author_id,public_metrics,geo,lang,context_annotations'
+SEARCH_USER_FIELDS = 'location,verified,public_metrics'
+SEARCH_EXPANSIONS = 'author_id,geo.place_id'
+SEARCH_PLACE_FIELDS = 'full_name,country,geo'
+TWITTERAPI_IO_BASE_PARAMS = {
+    'tweet.fields': SEARCH_TWEET_FIELDS,
+    'user.fields': SEARCH_USER_FIELDS,
+    'expansions': SEARCH_EXPANSIONS
+}
+
+# Official API v2 recent search caps queries at 512 characters, filters included
+OFFICIAL_QUERY_MAX_LENGTH = 512
+OFFICIAL_QUERY_FILTERS = " lang:en -is:retweet"
+
+# Default stream query: the first keywords, fetched concurrently in OR-shards
+DEFAULT_QUERY_KEYWORDS = 10
+STREAM_QUERY_SHARD_SIZE = 5
+
+# Quiet polls double the stream interval up to this multiple of the configured one
+STREAM_BACKOFF_MAX_FACTOR = 8
+
+# Tweet ids already delivered by the stream, remembered across polling windows
+STREAM_SEEN_IDS_MAX = 100_000
+
+def _parse_coords_batch(texts: List[str]) -> np.ndarray:
+    """(N, 2) array of (lat, lon) for plain in-range "lat, lon" strings, NaN rows otherwise"""
+    coords = np.full((len(texts), 2), np.nan)
+    rows = [i for i, text in enumerate(texts) if COORDINATE_TEXT_RE.fullmatch(text)]
+    
+    if rows:
+        # One C-level parse over every matched string
+        parsed = np.fromstring(','.join([texts[i] for i in rows]), sep=',').reshape(-1, 2)
+        in_range = (np.abs(parsed[:, 0]) <= 90) & (np.abs(parsed[:, 1]) <= 180)
+        coords[np.asarray(rows)[in_range]] = parsed[in_range]
+    
+    return coords
+
+def _make_http_client():
+    """Keep-alive HTTP client for TwitterAPI.io, over HTTP/2 when h2 is installed"""
+    if httpx is None:
+        return requests.Session()
+    try:
+        return httpx.Client(http2=True, timeout=30)
+    except ImportError:  # http2=True needs the h2 package
+        return httpx.Client(timeout=30)
+
+def _pack_queries(keywords: List[str], max_length: int) -> List[str]:
+    """Greedily join keywords into as few OR-queries of at most max_length as possible"""
+    packed = []
+    current = []
+    length = 0
+    
+    for keyword in keywords:
+        added = len(keyword) + (len(' OR ') if current else 0)
+        if current and length + added > max_length:
+            packed.append(' OR '.join(current))
+            current = []
+            length = 0
+            added = len(keyword)
+        current.append(keyword)
+        length += added
+    
+    if current:
+        packed.append(' OR '.join(current))
+    return packed
+
+# Per-service LRU of classifications keyed on exact tweet text (retweets, bot duplicates)
+CLASSIFICATION_CACHE_SIZE = 16384
+
+# Shared memory blocks holding classifier/idf weights for DISASTER_SHM=1 workers
+SHM_COEF_NAME = 'disaster_coef'
+SHM_IDF_NAME = 'disaster_idf'
+
+def _idf_owner(vectorizer):
+    """Return the estimator holding idf_ (a TfidfVectorizer or the last pipeline step)"""
+    return vectorizer[-1] if hasattr(vectorizer, 'steps') else vectorizer
+
+def publish_shared_weights(model, vectorizer) -> List[SharedMemory]:
+    """Copy coef_ and idf_ into named shared memory blocks; the caller owns and unlinks them"""
+    blocks = []
+    for name, array in ((SHM_COEF_NAME, model.coef_), (SHM_IDF_NAME, _idf_owner(vectorizer).idf_)):
+        array = np.asarray(array)
+        shm = SharedMemory(name=name, create=True, size=array.nbytes)
+        np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+        blocks.append(shm)
+    return blocks
+
+def _attach_shared_weights(name: str, like: np.ndarray):
+    """Attach to a published block and view it with the shape/dtype of `like`"""
+    shm = SharedMemory(name=name)
+    # Attaching registers the block with this process's resource tracker, which would
+    # unlink it when the worker exits; only the publisher should do that
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    # Blocks are sized exactly (page-rounded on some platforms), so a block
+    # published from a different model shows up as a size mismatch
+    page_rounded = -(-like.nbytes // mmap.PAGESIZE) * mmap.PAGESIZE
+    if not like.nbytes <= shm.size <= page_rounded:
+        shm.close()
+        raise ValueError(f"{name} holds {shm.size} bytes, the loaded model needs {like.nbytes}")
+    view = np.ndarray(like.shape, like.dtype, buffer=shm.buf)
+    view.flags.writeable = False
+    return shm, view
+
+def _priority_kernel(confidence, urgency_hit, disaster_hit, action_hit, has_coordinates, has_location):
+    """Combine pre-computed keyword hits and location flags into a priority score"""
+    priority_score = confidence
+    if urgency_hit:
+        priority_score += 0.2
+    if disaster_hit:
+        priority_score += 0.15
+    if has_coordinates:
+        priority_score += 0.15
+    elif has_location:
+        priority_score += 0.1
+    if action_hit:
+        priority_score += 0.1
+    return min(priority_score, 1.0)
+
+if njit is not None:
+    _priority_kernel = njit(cache=True)(_priority_kernel)
+    
+    @njit(cache=True)
+    def _priority_scores_kernel(confidences, urgency_hit, disaster_hit, action_hit, has_coordinates, has_location):
+        """_priority_kernel over precomputed per-tweet columns"""
+        scores = np.empty(confidences.shape[0])
+        for i in range(confidences.shape[0]):
+            scores[i] = _priority_kernel(
+                confidences[i], urgency_hit[i], disaster_hit[i], action_hit[i],
+                has_coordinates[i], has_location[i]
+            )
+        return scores
+else:
+    def _priority_scores_kernel(confidences, urgency_hit, disaster_hit, action_hit, has_coordinates, has_location):
+        """_priority_kernel over precomputed per-tweet columns"""
+        # Same boosts, added in the same order as _priority_kernel
+        scores = confidences.copy()
+        scores += np.where(urgency_hit, 0.2, 0.0)
+        scores += np.where(disaster_hit, 0.15, 0.0)
+        scores += np.where(has_coordinates, 0.15, np.where(has_location, 0.1, 0.0))
+        scores += np.where(action_hit, 0.1, 0.0)
+        return np.minimum(scores, 1.0)
+
+@lru_cache(maxsize=8192)
+def _geocode_cached(location_text: str) -> Optional[np.ndarray]:
+    """Resolve a raw location string to a read-only (lat, lon) array, memoized per string"""
+    # Normalize inside the cache so repeated locations skip it too
+    location_text = location_text.strip().lower()
+    
+    # Check for direct coordinate format
+    if ',' in location_text and any(c.isdigit() for c in location_text):
+        try:
+            parts = location_text.split(',')
+            if len(parts) == 2:
+                lat, lon = float(parts[0].strip()), float(parts[1].strip())
+                if -90 <= lat <= 90 and -180 <= lon <= 180:
+                    coordinates = np.array([lat, lon])
+                    coordinates.flags.writeable = False
+                    return coordinates
+        except:
+            pass
+    
+    # Check against known locations
+    cities = LOCATION_CITY_RE.findall(location_text)
+    if not cities:
+        return None
+    
+    return LOCATION_CITY_COORDS[min(LOCATION_CITY_ORDER[city] for city in cities)]
 
 @dataclass
 class TwitterConfig:
@@ -20,6 +274,7 @@ class TwitterConfig:
     access_token_secret: Optional[str] = None
     api_type: str = "official"  # "official" or "twitterapi_io"
     simulation_mode: bool = True
+    verify_on_init: bool = False  # probe get_me() once per token before trusting the client
 
 class RealTwitterIntegrationService:
     """
@@ -27,15 +282,27 @@ class RealTwitterIntegrationService:
     Supports both Official Twitter API v2 and TwitterAPI.io
     """
     
+    # Credential hashes that already passed the get_me() probe in this process
+    _verified_tokens: set = set()
+    
     def __init__(self, config: TwitterConfig = None):
         self.config = config or TwitterConfig()
         self.is_streaming = False
         self.stream_thread = None
+        self.stream_loop = None  # event loop owned by stream_thread
+        self.stream_task = None
         self.tweet_callback = None
         self.rate_limit_reset = None
         self.requests_made = 0
         self.daily_cost = 0.0
         
+        # classify_many runs on several model pool threads, so the LRU is locked
+        self._classification_cache = OrderedDict()
+        self._classification_lock = threading.Lock()
+        
+        # Ids stream_iter has already yielded, oldest first (only touched by the stream task)
+        self._seen_tweet_ids = OrderedDict()
+        
         # Load environment variables if config not provided
         if not self.config.api_key:
             self.config.api_key = os.getenv('TWITTER_API_KEY')
@@ -54,13 +321,17 @@ class RealTwitterIntegrationService:
             self.api_client = self._init_official_client()
         elif self.config.api_type == "twitterapi_io" and self.config.api_key:
             self.config.simulation_mode = False
-            self.api_client = None  # Will use requests directly
+            self.api_client = None  # Will use http_client directly
         else:
             self.config.simulation_mode = True
             self.api_client = None
         
-        # Load the trained model for classification
-        self.load_model()
+        # Reused across polls so only the first request pays the TCP/TLS handshake
+        self.http_client = None
+        if self.config.api_type == "twitterapi_io" and not self.config.simulation_mode:
+            self.http_client = _make_http_client()
+        
+        # The trained model is loaded on first use, see the model property
         
         # Disaster-related keywords for filtering
         self.disaster_keywords = [
@@ -70,38 +341,20 @@ class RealTwitterIntegrationService:
             'accident', 'crash', 'incident', 'alert', 'warning', 'danger',
             'breaking', 'critical', 'severe', 'major', 'massive'
         ]
+        self._disaster_keyword_set = frozenset(self.disaster_keywords)
         
         # Enhanced location mapping with coordinates
-        self.location_coordinates = {
-            'san francisco': [37.7749, -122.4194],
-            'los angeles': [34.0522, -118.2437],
-            'new york': [40.7128, -74.0060],
-            'houston': [29.7604, -95.3698],
-            'chicago': [41.8781, -87.6298],
-            'miami': [25.7617, -80.1918],
-            'seattle': [47.6062, -122.3321],
-            'denver': [39.7392, -104.9903],
-            'atlanta': [33.7490, -84.3880],
-            'phoenix': [33.4484, -112.0740],
-            'philadelphia': [39.9526, -75.1652],
-            'dallas': [32.7767, -96.7970],
-            'boston': [42.3601, -71.0589],
-            'detroit': [42.3314, -83.0458],
-            'washington': [38.9072, -77.0369],
-            'las vegas': [36.1699, -115.1398],
-            'portland': [45.5152, -122.6784],
-            'nashville': [36.1627, -86.7816],
-            'memphis': [35.1495, -90.0490],
-            'louisville': [38.2527, -85.7585]
-        }
+        self.location_coordinates = LOCATION_COORDINATES
         
         print(f"🔧 Twitter Integration initialized:")
         print(f"   API Type: {self.config.api_type}")
         print(f"   Simulation Mode: {self.config.simulation_mode}")
-        print(f"   Model Loaded: {bool(self.model)}")
     
     def _init_official_client(self):
         """Initialize official Twitter API v2 client"""
+        # tweepy is only needed for the official API, so import it on demand
+        import tweepy
+        
         try:
             if self.config.access_token and self.config.access_token_secret:
                 # OAuth 1.0a User Context
@@ -120,14 +373,20 @@ class RealTwitterIntegrationService:
                     wait_on_rate_limit=True
                 )
             
-            # Test the connection
-            try:
-                client.get_me()
-                print("✅ Official Twitter API v2 client initialized successfully")
-                return client
-            except Exception as e:
-                print(f"⚠️ Twitter API test failed: {e}")
-                return None
+            # Test the connection once per credential set, not per instance
+            token_hash = hashlib.blake2b(
+                f"{self.config.bearer_token}:{self.config.access_token}".encode()
+            ).hexdigest()
+            if self.config.verify_on_init and token_hash not in self._verified_tokens:
+                try:
+                    client.get_me()
+                    RealTwitterIntegrationService._verified_tokens.add(token_hash)
+                except Exception as e:
+                    print(f"⚠️ Twitter API test failed: {e}")
+                    return None
+            
+            print("✅ Official Twitter API v2 client initialized successfully")
+            return client
                 
         except Exception as e:
             print(f"❌ Failed to initialize Twitter API client: {e}")
@@ -136,35 +395,132 @@ class RealTwitterIntegrationService:
     def load_model(self):
         """Load the trained disaster classification model"""
         try:
-            with open('disaster_model.pkl', 'rb') as f:
-                self.model = pickle.load(f)
-            with open('tfidf_vectorizer.pkl', 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            # Uncompressed joblib dumps are memory-mapped, so worker processes share
+            # the weight pages through the OS page cache; plain pickles load as before
+            self.model = joblib.load('disaster_model.pkl', mmap_mode='r')
+            self.vectorizer = joblib.load('tfidf_vectorizer.pkl', mmap_mode='r')
+            # Weights are stored sparse on disk; dense float32 is faster to apply
+            if issparse(self.model.coef_):
+                self.model.densify()
+            if os.environ.get('DISASTER_SHM') == '1':
+                self._use_shared_weights()
             print("✅ Loaded trained disaster classification model")
         except FileNotFoundError:
             print("⚠️ Model files not found, will use basic keyword matching")
             self.model = None
             self.vectorizer = None
+        
+        self.quantized_model = load_quantized_model(self.model)
+    
+    def _use_shared_weights(self):
+        """Swap coef_/idf_ for views of the blocks published by share_model_weights.py"""
+        try:
+            coef_shm, coef = _attach_shared_weights(SHM_COEF_NAME, self.model.coef_)
+        except FileNotFoundError:
+            print("⚠️ Shared model weights not published, using the on-disk copy")
+            return
+        except ValueError as e:
+            print(f"⚠️ Shared model weights don't match ({e}), using the on-disk copy")
+            return
+        try:
+            idf_shm, idf = _attach_shared_weights(SHM_IDF_NAME, _idf_owner(self.vectorizer).idf_)
+        except (FileNotFoundError, ValueError) as e:
+            coef_shm.close()
+            print(f"⚠️ Shared model weights unusable ({e}), using the on-disk copy")
+            return
+        # The views are only valid while the SharedMemory handles stay open
+        self._shm_blocks = (coef_shm, idf_shm)
+        self.model.coef_ = coef
+        _idf_owner(self.vectorizer).idf_ = idf
+        print("✅ Attached shared model weights")
+    
+    # load_model assigns all three attributes, caching whichever property ran it
+    @cached_property
+    def model(self):
+        """Trained classifier, loaded from disk on first access"""
+        self.load_model()
+        return self.__dict__['model']
+    
+    @cached_property
+    def vectorizer(self):
+        """Fitted text vectorizer, loaded from disk on first access"""
+        self.load_model()
+        return self.__dict__['vectorizer']
+    
+    @cached_property
+    def quantized_model(self):
+        """int8 classifier weights, or None, loaded on first access"""
+        self.load_model()
+        return self.__dict__['quantized_model']
     
     def classify_tweet(self, text: str) -> Dict:
         """Classify a tweet as disaster-related or not"""
+        return self.classify_many([text])[0]
+    
+    def classify_many(self, texts: List[str]) -> List[Dict]:
+        """Classify a batch of tweets, running the model only on texts not seen recently"""
+        if not texts:
+            return []
+        
+        cache = self._classification_cache
+        results = [None] * len(texts)
+        missing = {}  # uncached text -> positions in texts
+        
+        with self._classification_lock:
+            for i, text in enumerate(texts):
+                cached = cache.get(text)
+                if cached is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    cache.move_to_end(text)
+                    results[i] = cached
+        
+        if missing:
+            classifications = self._classify_uncached(list(missing))
+            
+            with self._classification_lock:
+                for (text, positions), classification in zip(missing.items(), classifications):
+                    cache[text] = classification
+                    for i in positions:
+                        results[i] = classification
+                while len(cache) > CLASSIFICATION_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        # Hand out copies so callers can't mutate the cached entries
+        return [dict(classification) for classification in results]
+    
+    def _classify_uncached(self, texts: List[str]) -> List[Dict]:
+        """Classify a batch of tweets with one vectorizer/model call"""
         if self.model and self.vectorizer:
             try:
-                text_vectorized = self.vectorizer.transform([text])
-                prediction = self.model.predict(text_vectorized)[0]
-                confidence = max(self.model.predict_proba(text_vectorized)[0])
+                texts_vectorized = self.vectorizer.transform(texts)
                 
-                return {
-                    'is_disaster': bool(prediction),
-                    'confidence': float(confidence),
-                    'method': 'ml_model'
-                }
+                if self.quantized_model is not None:
+                    predictions, confidences = predict_quantized(self.quantized_model, texts_vectorized)
+                else:
+                    probabilities = self.model.predict_proba(texts_vectorized)
+                    predictions = self.model.classes_[probabilities.argmax(axis=1)]
+                    confidences = probabilities.max(axis=1)
+                
+                return [
+                    {
+                        'is_disaster': bool(prediction),
+                        'confidence': float(confidence),
+                        'method': 'ml_model'
+                    }
+                    for prediction, confidence in zip(predictions, confidences)
+                ]
             except Exception as e:
                 print(f"Error using ML model: {e}")
         
         # Fallback to keyword matching
-        text_lower = text.lower()
-        disaster_score = sum(1 for keyword in self.disaster_keywords if keyword in text_lower)
+        return [self._classify_by_keywords(text) for text in texts]
+    
+    def _classify_by_keywords(self, text: str) -> Dict:
+        """Keyword-matching classification used when the ML model is unavailable"""
+        # Whole-word matches, so e.g. "fired" no longer counts as "fire"
+        tokens = set(KEYWORD_TOKEN_RE.findall(text.lower()))
+        disaster_score = len(tokens & self._disaster_keyword_set)
         is_disaster = disaster_score > 0
         confidence = min(0.5 + (disaster_score * 0.1), 0.95) if is_disaster else 0.3
         
@@ -179,17 +535,20 @@ class RealTwitterIntegrationService:
         if not self.api_client:
             raise ValueError("Official Twitter API client not initialized")
         
+        # Already imported by _init_official_client, needed for TooManyRequests
+        import tweepy
+        
         try:
             # Enhanced query with disaster-specific filters
-            enhanced_query = f"({query}) lang:en -is:retweet"
+            enhanced_query = f"({query}){OFFICIAL_QUERY_FILTERS}"
             
             tweets = self.api_client.search_recent_tweets(
                 query=enhanced_query,
                 max_results=min(max_results, 100),
-                tweet_fields=['created_at', 'author_id', 'public_metrics', 'geo', 'lang', 'context_annotations'],
-                user_fields=['location', 'verified', 'public_metrics'],
-                expansions=['author_id', 'geo.place_id'],
-                place_fields=['full_name', 'country', 'geo']
+                tweet_fields=SEARCH_TWEET_FIELDS,
+                user_fields=SEARCH_USER_FIELDS,
+                expansions=SEARCH_EXPANSIONS,
+                place_fields=SEARCH_PLACE_FIELDS
             )
             
             if not tweets.data:
@@ -200,24 +559,39 @@ class RealTwitterIntegrationService:
             users = {user.id: user for user in tweets.includes.get('users', [])} if tweets.includes else {}
             places = {place.id: place for place in tweets.includes.get('places', [])} if tweets.includes else {}
             
-            for tweet in tweets.data:
-                processed_tweet = self._process_official_tweet(tweet, users, places)
+            # Classify the whole page with one vectorizer/model call
+            classifications = self.classify_many([tweet.text for tweet in tweets.data])
+            now_iso = datetime.now().isoformat()  # one fallback timestamp per page
+            
+            for tweet, classification in zip(tweets.data, classifications):
+                processed_tweet = self._process_official_tweet(tweet, users, places, classification, now_iso)
                 processed_tweets.append(processed_tweet)
+            self._score_page(processed_tweets)
             
             self.requests_made += 1
             print(f"📡 Retrieved {len(processed_tweets)} tweets from Official API")
             
             return processed_tweets
             
-        except tweepy.TooManyRequests:
+        except tweepy.TooManyRequests as e:
             print("⚠️ Rate limit exceeded for Official Twitter API")
+            self._note_rate_limit(e.response.headers)
             return []
         except Exception as e:
             print(f"❌ Error searching tweets with Official API: {e}")
             return []
     
-    def search_tweets_twitterapi_io(self, query: str, max_results: int = 100) -> List[Dict]:
-        """Search for tweets using TwitterAPI.io"""
+    def _note_rate_limit(self, headers):
+        """Record when a 429'd API's rate limit window resets (epoch seconds)"""
+        reset = headers.get('x-rate-limit-reset') if headers is not None else None
+        if reset:
+            try:
+                self.rate_limit_reset = float(reset)
+            except ValueError:
+                pass
+    
+    def _twitterapi_io_request(self, query: str, max_results: int):
+        """Build the headers and params for a TwitterAPI.io recent search"""
         if not self.config.api_key:
             raise ValueError("TwitterAPI.io API key not provided")
         
@@ -227,45 +601,60 @@ class RealTwitterIntegrationService:
         }
         
         params = {
+            **TWITTERAPI_IO_BASE_PARAMS,
             'query': f"{query} lang:en",
-            'max_results': min(max_results, 100),
-            'tweet.fields': 'created_at,author_id,public_metrics,geo,lang,context_annotations',
-            'user.fields': 'location,verified,public_metrics',
-            'expansions': 'author_id,geo.place_id'
+            'max_results': min(max_results, 100)
         }
         
+        return headers, params
+    
+    def _parse_twitterapi_io_response(self, data: Dict) -> List[Dict]:
+        """Process a TwitterAPI.io search payload and account for its cost"""
+        tweets = []
+        
+        users = {}
+        places = {}
+        if 'includes' in data:
+            users = {user['id']: user for user in data['includes'].get('users', [])}
+            places = {place['id']: place for place in data['includes'].get('places', [])}
+        
+        # Classify the whole page with one vectorizer/model call
+        page = data.get('data', [])
+        classifications = self.classify_many([tweet_data['text'] for tweet_data in page])
+        now_iso = datetime.now().isoformat()  # one fallback timestamp per page
+        
+        for tweet_data, classification in zip(page, classifications):
+            processed_tweet = self._process_twitterapi_io_tweet(tweet_data, users, places, classification, now_iso)
+            tweets.append(processed_tweet)
+        self._score_page(tweets)
+        
+        # Calculate cost
+        tweet_count = len(tweets)
+        cost = (tweet_count / 1000) * 0.15  # $0.15 per 1K tweets
+        self.daily_cost += cost
+        self.requests_made += 1
+        
+        print(f"📡 Retrieved {tweet_count} tweets from TwitterAPI.io (Cost: ${cost:.4f})")
+        
+        return tweets
+    
+    def search_tweets_twitterapi_io(self, query: str, max_results: int = 100) -> List[Dict]:
+        """Search for tweets using TwitterAPI.io"""
+        headers, params = self._twitterapi_io_request(query, max_results)
+        
         try:
-            response = requests.get(
-                "https://api.twitterapi.io/v2/tweets/search/recent",
+            response = (self.http_client or requests).get(
+                TWITTERAPI_IO_SEARCH_URL,
                 headers=headers,
                 params=params,
                 timeout=30
             )
             
             if response.status_code == 200:
-                data = response.json()
-                tweets = []
-                
-                users = {}
-                places = {}
-                if 'includes' in data:
-                    users = {user['id']: user for user in data['includes'].get('users', [])}
-                    places = {place['id']: place for place in data['includes'].get('places', [])}
-                
-                for tweet_data in data.get('data', []):
-                    processed_tweet = self._process_twitterapi_io_tweet(tweet_data, users, places)
-                    tweets.append(processed_tweet)
-                
-                # Calculate cost
-                tweet_count = len(tweets)
-                cost = (tweet_count / 1000) * 0.15  # $0.15 per 1K tweets
-                self.daily_cost += cost
-                self.requests_made += 1
-                
-                print(f"📡 Retrieved {tweet_count} tweets from TwitterAPI.io (Cost: ${cost:.4f})")
-                
-                return tweets
+                return self._parse_twitterapi_io_response(json_loads(response.content))
             else:
+                if response.status_code == 429:
+                    self._note_rate_limit(response.headers)
                 print(f"❌ TwitterAPI.io Error: {response.status_code} - {response.text}")
                 return []
                 
@@ -273,7 +662,36 @@ class RealTwitterIntegrationService:
             print(f"❌ Error searching tweets with TwitterAPI.io: {e}")
             return []
     
-    def _process_official_tweet(self, tweet, users: Dict, places: Dict) -> Dict:
+    async def search_tweets_twitterapi_io_async(self, session, query: str, max_results: int = 100) -> List[Dict]:
+        """Search TwitterAPI.io over a shared aiohttp session"""
+        if session is None:
+            return await asyncio.to_thread(self.search_tweets_twitterapi_io, query, max_results)
+        
+        headers, params = self._twitterapi_io_request(query, max_results)
+        
+        try:
+            async with session.get(
+                TWITTERAPI_IO_SEARCH_URL,
+                headers=headers,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                if response.status != 200:
+                    if response.status == 429:
+                        self._note_rate_limit(response.headers)
+                    print(f"❌ TwitterAPI.io Error: {response.status} - {await response.text()}")
+                    return []
+                data = json_loads(await response.read())
+            
+            # Classification of the payload is CPU-bound, keep it off the event loop
+            return await asyncio.to_thread(self._parse_twitterapi_io_response, data)
+            
+        except Exception as e:
+            print(f"❌ Error searching tweets with TwitterAPI.io: {e}")
+            return []
+    
+    def _process_official_tweet(self, tweet, users: Dict, places: Dict, classification: Dict,
+                                now_iso: Optional[str] = None) -> Dict:
         """Process a tweet from Official Twitter API v2"""
         # Get user information
         user = users.get(tweet.author_id, {})
@@ -300,21 +718,10 @@ class RealTwitterIntegrationService:
             location_text = user_location
             coordinates = self._get_coordinates_from_text(user_location)
         
-        # Classify the tweet
-        classification = self.classify_tweet(tweet.text)
-        
-        # Calculate priority score
-        priority_score = self._calculate_priority_score(
-            tweet.text, 
-            location_text, 
-            classification['confidence'],
-            coordinates is not None
-        )
-        
         return {
             'id': tweet.id,
             'text': tweet.text,
-            'created_at': tweet.created_at.isoformat() if tweet.created_at else datetime.now().isoformat(),
+            'created_at': tweet.created_at.isoformat() if tweet.created_at else (now_iso or datetime.now().isoformat()),
             'author_id': tweet.author_id,
             'location': location_text,
             'coordinates': coordinates,
@@ -322,14 +729,15 @@ class RealTwitterIntegrationService:
             'lang': getattr(tweet, 'lang', 'en'),
             'is_disaster': classification['is_disaster'],
             'confidence': classification['confidence'],
-            'priority_score': priority_score,
+            'priority_score': None,  # filled in per page by _score_page
             'classification_method': classification['method'],
             'user_verified': getattr(user, 'verified', False) if user else False,
             'source': 'official_api',
             'simulation': False
         }
     
-    def _process_twitterapi_io_tweet(self, tweet_data: Dict, users: Dict, places: Dict) -> Dict:
+    def _process_twitterapi_io_tweet(self, tweet_data: Dict, users: Dict, places: Dict,
+                                     classification: Dict, now_iso: Optional[str] = None) -> Dict:
         """Process a tweet from TwitterAPI.io"""
         # Get user information
         user = users.get(tweet_data.get('author_id'), {})
@@ -358,21 +766,10 @@ class RealTwitterIntegrationService:
             location_text = user_location
             coordinates = self._get_coordinates_from_text(user_location)
         
-        # Classify the tweet
-        classification = self.classify_tweet(tweet_data['text'])
-        
-        # Calculate priority score
-        priority_score = self._calculate_priority_score(
-            tweet_data['text'], 
-            location_text, 
-            classification['confidence'],
-            coordinates is not None
-        )
-        
         return {
             'id': tweet_data['id'],
             'text': tweet_data['text'],
-            'created_at': tweet_data.get('created_at', datetime.now().isoformat()),
+            'created_at': tweet_data['created_at'] if 'created_at' in tweet_data else (now_iso or datetime.now().isoformat()),
             'author_id': tweet_data.get('author_id'),
             'location': location_text,
             'coordinates': coordinates,
@@ -380,7 +777,7 @@ class RealTwitterIntegrationService:
             'lang': tweet_data.get('lang', 'en'),
             'is_disaster': classification['is_disaster'],
             'confidence': classification['confidence'],
-            'priority_score': priority_score,
+            'priority_score': None,  # filled in per page by _score_page
             'classification_method': classification['method'],
             'user_verified': user.get('verified', False),
             'source': 'twitterapi_io',
@@ -392,57 +789,75 @@ class RealTwitterIntegrationService:
         if not location_text:
             return None
         
-        location_lower = location_text.lower()
+        coordinates = _geocode_cached(location_text)
+        return coordinates.tolist() if coordinates is not None else None
+    
+    def _get_coordinates_many(self, location_texts: List[Optional[str]]) -> List[Optional[List[float]]]:
+        """_get_coordinates_from_text over a batch, parsing numeric locations in one pass"""
+        texts = [text or '' for text in location_texts]
+        coords = _parse_coords_batch(texts)
         
-        # Check for direct coordinate format
-        if ',' in location_text and any(c.isdigit() for c in location_text):
-            try:
-                parts = location_text.split(',')
-                if len(parts) == 2:
-                    lat, lon = float(parts[0].strip()), float(parts[1].strip())
-                    if -90 <= lat <= 90 and -180 <= lon <= 180:
-                        return [lat, lon]
-            except:
-                pass
+        return [
+            row.tolist() if not np.isnan(row[0]) else self._get_coordinates_from_text(text)
+            for text, row in zip(texts, coords)
+        ]
+    
+    def _calculate_priority_scores_vec(self, texts: List[str], locations: List[Optional[str]],
+                                       base_confidences, has_coordinates) -> np.ndarray:
+        """_calculate_priority_score over a batch: regex sweeps into columns, then one kernel"""
+        urgency_hit = np.fromiter((PRIORITY_URGENCY_RE.search(t) is not None for t in texts), bool, len(texts))
+        disaster_hit = np.fromiter((PRIORITY_DISASTER_RE.search(t) is not None for t in texts), bool, len(texts))
+        action_hit = np.fromiter((PRIORITY_ACTION_RE.search(t) is not None for t in texts), bool, len(texts))
+        has_location = np.fromiter((bool(location) for location in locations), bool, len(texts))
+        has_coordinates = np.asarray(has_coordinates, dtype=bool)
         
-        # Check against known locations
-        for city, coords in self.location_coordinates.items():
-            if city in location_lower:
-                return coords
+        return _priority_scores_kernel(
+            np.array(base_confidences, dtype=np.float64), urgency_hit, disaster_hit, action_hit,
+            has_coordinates, has_location
+        )
+    
+    def _score_page(self, tweets: List[Dict]):
+        """Fill in priority_score for a page of processed tweets in one vectorized pass"""
+        if not tweets:
+            return
         
-        return None
+        scores = self._calculate_priority_scores_vec(
+            [tweet['text'] for tweet in tweets],
+            [tweet['location'] for tweet in tweets],
+            [tweet['confidence'] for tweet in tweets],
+            [tweet['coordinates'] is not None for tweet in tweets]
+        )
+        for tweet, score in zip(tweets, scores.tolist()):
+            tweet['priority_score'] = score
     
     def _calculate_priority_score(self, text: str, location: str, base_confidence: float, has_coordinates: bool) -> float:
         """Calculate priority score for a tweet"""
-        priority_score = base_confidence
-        
-        # Urgency boost for critical keywords
-        urgency_keywords = ['urgent', 'emergency', 'help', 'breaking', 'critical', 'severe', 'major']
-        if any(keyword in text.lower() for keyword in urgency_keywords):
-            priority_score += 0.2
-        
-        # Disaster type boost
-        disaster_keywords = ['fire', 'earthquake', 'flood', 'tornado', 'hurricane', 'explosion']
-        if any(keyword in text.lower() for keyword in disaster_keywords):
-            priority_score += 0.15
-        
-        # Location boost
-        if has_coordinates:
-            priority_score += 0.15
-        elif location:
-            priority_score += 0.1
+        # Keyword boosts for urgency, disaster type and response actions
+        urgency_hit = PRIORITY_URGENCY_RE.search(text) is not None
+        disaster_hit = PRIORITY_DISASTER_RE.search(text) is not None
+        action_hit = PRIORITY_ACTION_RE.search(text) is not None
         
-        # Action keywords boost
-        action_keywords = ['evacuation', 'rescue', 'emergency services', 'first responders']
-        if any(keyword in text.lower() for keyword in action_keywords):
-            priority_score += 0.1
+        return _priority_kernel(
+            float(base_confidence), urgency_hit, disaster_hit, action_hit,
+            bool(has_coordinates), bool(location)
+        )
+    
+    def batch_search_tweets(self, keywords: List[str], max_results: int = 50) -> List[Dict]:
+        """Search many keywords with as few Official API calls as the query limit allows"""
+        # Room left once search_tweets_official_api wraps the query in (...) and filters
+        max_length = OFFICIAL_QUERY_MAX_LENGTH - len(OFFICIAL_QUERY_FILTERS) - 2
         
-        return min(priority_score, 1.0)
+        tweets_by_id = {}
+        for query in _pack_queries(keywords, max_length):
+            for tweet in self.search_tweets_official_api(query, max_results):
+                tweets_by_id.setdefault(tweet['id'], tweet)
+        return list(tweets_by_id.values())[:max_results]
     
     def search_tweets(self, query: str = None, max_results: int = 50) -> List[Dict]:
         """Search for tweets using the configured API"""
-        if query is None:
-            query = ' OR '.join(self.disaster_keywords[:10])
+        default_query = query is None
+        if default_query:
+            query = ' OR '.join(self.disaster_keywords[:DEFAULT_QUERY_KEYWORDS])
         
         if self.config.simulation_mode:
             print(f"🔄 Using simulation mode for query: {query}")
@@ -450,6 +865,9 @@ class RealTwitterIntegrationService:
         
         try:
             if self.config.api_type == "official":
+                if default_query and len(self.disaster_keywords) > DEFAULT_QUERY_KEYWORDS:
+                    # Every keyword fits in one or two packed queries, so cover them all
+                    return self.batch_search_tweets(self.disaster_keywords, max_results)
                 return self.search_tweets_official_api(query, max_results)
             elif self.config.api_type == "twitterapi_io":
                 return self.search_tweets_twitterapi_io(query, max_results)
@@ -468,43 +886,153 @@ class RealTwitterIntegrationService:
         sim_service = TwitterIntegrationService(simulation_mode=True)
         return sim_service.search_tweets_simulation(query, max_results)
     
-    def start_streaming(self, callback_function, interval: int = 60):
-        """Start streaming tweets at regular intervals"""
-        self.tweet_callback = callback_function
+    async def _search_sharded_twitterapi_io_async(self, session, max_results: int) -> List[Dict]:
+        """Fetch the default keyword query as concurrent OR-shards, deduplicated by id"""
+        keywords = self.disaster_keywords[:DEFAULT_QUERY_KEYWORDS]
+        shards = [
+            ' OR '.join(keywords[i:i + STREAM_QUERY_SHARD_SIZE])
+            for i in range(0, len(keywords), STREAM_QUERY_SHARD_SIZE)
+        ]
+        per_shard = -(-max_results // len(shards))
+        
+        pages = await asyncio.gather(*(
+            self.search_tweets_twitterapi_io_async(session, shard, per_shard) for shard in shards
+        ))
+        
+        tweets_by_id = {}
+        for page in pages:
+            for tweet in page:
+                tweets_by_id.setdefault(tweet['id'], tweet)
+        return list(tweets_by_id.values())
+    
+    async def search_tweets_async(self, session=None, query: str = None, max_results: int = 50) -> List[Dict]:
+        """Search for tweets without blocking the event loop"""
+        if self.config.simulation_mode or self.config.api_type != "twitterapi_io":
+            # tweepy and the simulator are synchronous, run them in a worker thread;
+            # query stays None so search_tweets can pack every keyword itself
+            return await asyncio.to_thread(self.search_tweets, query, max_results)
+        
+        default_query = query is None
+        if default_query:
+            query = ' OR '.join(self.disaster_keywords[:DEFAULT_QUERY_KEYWORDS])
+        
+        try:
+            if default_query and session is not None:
+                return await self._search_sharded_twitterapi_io_async(session, max_results)
+            return await self.search_tweets_twitterapi_io_async(session, query, max_results)
+        except Exception as e:
+            print(f"❌ Real API failed, falling back to simulation: {e}")
+            return await asyncio.to_thread(self._generate_simulated_tweets, query, max_results)
+    
+    def _unseen(self, tweets: List[Dict]) -> List[Dict]:
+        """Drop tweets whose id was already streamed and remember the new ones"""
+        seen = self._seen_tweet_ids
+        fresh = []
+        
+        for tweet in tweets:
+            if tweet['id'] in seen:
+                continue
+            seen[tweet['id']] = None
+            fresh.append(tweet)
+        
+        while len(seen) > STREAM_SEEN_IDS_MAX:
+            seen.popitem(last=False)
+        return fresh
+    
+    async def stream_iter(self, session=None, interval: int = 60):
+        """
+        Yield batches of new disaster tweets, polling every interval seconds.
+        Quiet polls back off exponentially (up to STREAM_BACKOFF_MAX_FACTOR x interval),
+        polls with disaster tweets step back toward interval, and a rate limit
+        pauses polling until its window resets.
+        """
         self.is_streaming = True
+        api_mode = "simulation" if self.config.simulation_mode else f"real API ({self.config.api_type})"
+        print(f"🚀 Started Twitter streaming in {api_mode} mode (interval: {interval}s)")
+        
+        current_interval = interval
         
-        def stream_worker():
+        try:
             while self.is_streaming:
+                disaster_tweets = []
                 try:
                     # Fetch new tweets
-                    tweets = self.search_tweets(max_results=20)
-                    
-                    # Filter for disaster tweets only
-                    disaster_tweets = [t for t in tweets if t['is_disaster']]
+                    tweets = await self.search_tweets_async(session, max_results=20)
                     
-                    if disaster_tweets and self.tweet_callback:
-                        self.tweet_callback(disaster_tweets)
+                    # Filter for disaster tweets the stream hasn't delivered yet
+                    disaster_tweets = self._unseen([t for t in tweets if t['is_disaster']])
                     
-                    # Wait for next interval
-                    time.sleep(interval)
+                    if disaster_tweets:
+                        yield disaster_tweets
                     
                 except Exception as e:
                     print(f"❌ Error in streaming: {e}")
-                    time.sleep(interval)
+                
+                if disaster_tweets:
+                    current_interval = max(current_interval / 2, interval)
+                else:
+                    current_interval = min(current_interval * 2, interval * STREAM_BACKOFF_MAX_FACTOR)
+                
+                # Wait for next poll, or for the rate limit window if that is later
+                delay = current_interval
+                if self.rate_limit_reset:
+                    delay = max(delay, self.rate_limit_reset - time.time())
+                await asyncio.sleep(delay)
+        finally:
+            self.is_streaming = False
+    
+    async def _stream_async(self, interval: int):
+        """Run stream_iter over its own aiohttp session, feeding tweet_callback"""
+        session = aiohttp.ClientSession() if aiohttp is not None else None
+        try:
+            async for tweets in self.stream_iter(session, interval):
+                if self.tweet_callback:
+                    self.tweet_callback(tweets)
+        finally:
+            if session:
+                await session.close()
+    
+    def start_streaming(self, callback_function, interval: int = 60):
+        """Start streaming tweets at regular intervals on a background event loop"""
+        self.tweet_callback = callback_function
+        self.is_streaming = True
         
-        self.stream_thread = threading.Thread(target=stream_worker, daemon=True)
-        self.stream_thread.start()
+        # The task exists before the thread starts, so stop_streaming can always cancel it
+        self.stream_loop = asyncio.new_event_loop()
+        self.stream_task = self.stream_loop.create_task(self._stream_async(interval))
         
-        api_mode = "simulation" if self.config.simulation_mode else f"real API ({self.config.api_type})"
-        print(f"🚀 Started Twitter streaming in {api_mode} mode (interval: {interval}s)")
+        def stream_worker(loop, task):
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                loop.close()
+        
+        self.stream_thread = threading.Thread(
+            target=stream_worker, args=(self.stream_loop, self.stream_task), daemon=True
+        )
+        self.stream_thread.start()
     
     def stop_streaming(self):
         """Stop the tweet streaming"""
         self.is_streaming = False
+        if self.stream_task and not self.stream_task.done():
+            try:
+                # Interrupts the interval sleep instead of waiting it out
+                self.stream_loop.call_soon_threadsafe(self.stream_task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
         if self.stream_thread:
             self.stream_thread.join(timeout=5)
         print("⏹️ Stopped Twitter streaming")
     
+    def close(self):
+        """Release the pooled HTTP connections"""
+        if self.http_client:
+            self.http_client.close()
+            self.http_client = None
+    
     def get_stream_status(self) -> Dict:
         """Get current streaming status"""
         return {
@@ -0,0 +1,36 @@
+"""
+Publish the trained model's weights to shared memory for multi-process workers.
+
+Run once before starting workers with DISASTER_SHM=1; keep it running for as long
+as the workers need the weights. Ctrl+C releases the shared memory blocks.
+"""
+import signal
+
+import joblib
+from scipy.sparse import issparse
+
+from real_twitter_integration import publish_shared_weights
+
+def main():
+    model = joblib.load('disaster_model.pkl')
+    vectorizer = joblib.load('tfidf_vectorizer.pkl')
+    if issparse(model.coef_):
+        model.densify()
+    
+    blocks = publish_shared_weights(model, vectorizer)
+    for shm in blocks:
+        print(f"✅ Published {shm.name} ({shm.size / 1024:.1f} KB)")
+    print("Workers started with DISASTER_SHM=1 will attach to these blocks. Press Ctrl+C to release.")
+    
+    try:
+        signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+        print("🛑 Released shared model weights")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,85 @@
 import requests
-import json
+import logging
+import re
 import time
-import random
 import threading
+import queue
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from string import Formatter
 from typing import List, Dict, Optional
-import pickle
+import joblib
 import os
+import numpy as np
+from scipy.sparse import issparse
+
+from quantized_model import load_quantized_model, predict_quantized
+
+logger = logging.getLogger(__name__)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, API payloads then parse with the stdlib
+    from json import loads as json_loads
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy path is used instead
+    njit = None
+
+# Priority score boosts, see calculate_priority_score
+PRIORITY_URGENCY_KEYWORDS = ['urgent', 'emergency', 'help', 'fire', 'earthquake', 'flood']
+PRIORITY_DISASTER_KEYWORDS = ['disaster', 'emergency', 'evacuation', 'rescue']
+
+# Case-insensitive alternations of the keyword lists, one scan per group
+PRIORITY_URGENCY_RE = re.compile('|'.join(map(re.escape, PRIORITY_URGENCY_KEYWORDS)), re.IGNORECASE)
+PRIORITY_DISASTER_RE = re.compile('|'.join(map(re.escape, PRIORITY_DISASTER_KEYWORDS)), re.IGNORECASE)
+
+# Word tokens of lowercased text, matched against the disaster keyword set
+KEYWORD_TOKEN_RE = re.compile(r'[a-z]+')
+
+# Adaptive stream batch sizing: page size bounds and EWMA weight of the newest rate sample
+STREAM_MIN_RESULTS = 10
+STREAM_MAX_RESULTS = 100
+STREAM_RATE_SMOOTHING = 0.3
+
+def _compile_template(template: str, fields: tuple):
+    """Parse a str.format template once into a function taking `fields` positionally"""
+    # (literal, argument index) pieces; only bare {name} placeholders are supported
+    pieces = []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        if field is not None and (format_spec or conversion or field not in fields):
+            raise ValueError(f"Unsupported placeholder {{{field}}} in template: {template}")
+        pieces.append((literal, fields.index(field) if field is not None else None))
+    
+    def render(*values):
+        return ''.join([
+            literal if index is None else literal + values[index]
+            for literal, index in pieces
+        ])
+    return render
+
+# Per-service LRU of classifications keyed on exact tweet text (templates, retweets)
+CLASSIFICATION_CACHE_SIZE = 16384
+
+if njit is not None:
+    @njit(cache=True)
+    def _combine_priority_factors(features):
+        """Combine (confidence, urgency, location, keyword) rows into scores"""
+        scores = np.empty(features.shape[0])
+        for i in range(features.shape[0]):
+            score = features[i, 0] + 0.15 * features[i, 1]
+            score = score + 0.1 * features[i, 2]
+            score = score + 0.1 * features[i, 3]
+            scores[i] = min(score, 1.0)
+        return scores
+else:
+    def _combine_priority_factors(features):
+        """Combine (confidence, urgency, location, keyword) rows into scores"""
+        scores = features[:, 0] + 0.15 * features[:, 1]
+        scores = scores + 0.1 * features[:, 2]
+        scores = scores + 0.1 * features[:, 3]
+        return np.minimum(scores, 1.0)
 
 class TwitterIntegrationService:
     """
@@ -19,9 +92,25 @@ class TwitterIntegrationService:
         self.api_key = api_key or os.getenv('TWITTER_API_KEY')
         self.simulation_mode = simulation_mode or not self.api_key
         self.base_url = "https://api.twitterapi.io/v2"
+        
+        # Keep-alive session so each stream poll reuses the TLS connection
+        self.http_client = None
+        if self.api_key:
+            self.http_client = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10)
+            self.http_client.mount('https://', adapter)
         self.is_streaming = False
         self.stream_thread = None
+        self.callback_thread = None  # runs tweet_callback off the fetch thread
+        self._stop_event = None
         self.tweet_callback = None
+        self._classification_cache = OrderedDict()
+        self._classification_lock = threading.Lock()
+        self._rng = np.random.default_rng()
+        # Simulated tweets always keep their generator labels; when True the model also
+        # classifies them, but only its agreement with those labels is recorded
+        self.evaluate_model_on_sim = False
+        self.sim_model_agreement = {'evaluated': 0, 'agreed': 0}
         
         # Load the trained model for classification
         self.load_model()
@@ -33,6 +122,8 @@ class TwitterIntegrationService:
             'explosion', 'collapse', 'storm', 'tsunami', 'landslide', 'avalanche',
             'accident', 'crash', 'incident', 'alert', 'warning', 'danger'
         ]
+        self._disaster_keyword_set = frozenset(self.disaster_keywords)
+        self._default_query = ' OR '.join(self.disaster_keywords[:10])  # top 10 keywords
         
         # Sample locations for simulation
         self.sample_locations = [
@@ -87,40 +178,107 @@ class TwitterIntegrationService:
             "Local farmers market busy in {location}",
             "Sports game was exciting in {location}"
         ]
+        
+        # Templates compiled once, so batch generation skips str.format's placeholder parsing
+        self._disaster_formatters = [
+            _compile_template(template, ('disaster_type', 'location', 'action_needed'))
+            for template in self.disaster_templates
+        ]
+        self._normal_formatters = [_compile_template(template, ('location',)) for template in self.normal_templates]
     
     def load_model(self):
         """Load the trained disaster classification model"""
         try:
-            with open('disaster_model.pkl', 'rb') as f:
-                self.model = pickle.load(f)
-            with open('tfidf_vectorizer.pkl', 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            # Uncompressed joblib dumps are memory-mapped, so worker processes share
+            # the weight pages through the OS page cache; plain pickles load as before
+            self.model = joblib.load('disaster_model.pkl', mmap_mode='r')
+            self.vectorizer = joblib.load('tfidf_vectorizer.pkl', mmap_mode='r')
+            # Weights are stored sparse on disk; dense float32 is faster to apply
+            if issparse(self.model.coef_):
+                self.model.densify()
             print("✅ Loaded trained disaster classification model")
         except FileNotFoundError:
             print("⚠️ Model files not found, will use basic keyword matching")
             self.model = None
             self.vectorizer = None
+        
+        self.quantized_model = load_quantized_model(self.model)
     
     def classify_tweet(self, text: str) -> Dict:
         """Classify a tweet as disaster-related or not"""
+        return self.classify_tweets_batch([text])[0]
+    
+    def classify_tweets_batch(self, texts: List[str]) -> List[Dict]:
+        """Classify many tweets, running the model only on texts not seen recently"""
+        if not texts:
+            return []
+        
+        cache = self._classification_cache
+        results = [None] * len(texts)
+        missing = {}  # uncached text -> positions in texts
+        
+        with self._classification_lock:
+            for i, text in enumerate(texts):
+                cached = cache.get(text)
+                if cached is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    cache.move_to_end(text)
+                    results[i] = cached
+        
+        if missing:
+            classifications = self._classify_uncached(list(missing))
+            
+            with self._classification_lock:
+                for (text, positions), classification in zip(missing.items(), classifications):
+                    cache[text] = classification
+                    for i in positions:
+                        results[i] = classification
+                while len(cache) > CLASSIFICATION_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        # Hand out copies so callers can't mutate the cached entries
+        return [dict(classification) for classification in results]
+    
+    def clear_classification_cache(self) -> int:
+        """Drop memoized classifications and return how many there were"""
+        with self._classification_lock:
+            cleared = len(self._classification_cache)
+            self._classification_cache.clear()
+        return cleared
+    
+    def _classify_uncached(self, texts: List[str]) -> List[Dict]:
+        """Classify many tweets with one vectorizer/model call"""
         if self.model and self.vectorizer:
-            # Use trained ML model
             try:
-                text_vectorized = self.vectorizer.transform([text])
-                prediction = self.model.predict(text_vectorized)[0]
-                confidence = max(self.model.predict_proba(text_vectorized)[0])
+                texts_vectorized = self.vectorizer.transform(texts)
                 
-                return {
-                    'is_disaster': bool(prediction),
-                    'confidence': float(confidence),
-                    'method': 'ml_model'
-                }
+                if self.quantized_model is not None:
+                    predictions, confidences = predict_quantized(self.quantized_model, texts_vectorized)
+                else:
+                    probabilities = self.model.predict_proba(texts_vectorized)
+                    predictions = self.model.classes_[probabilities.argmax(axis=1)]
+                    confidences = probabilities.max(axis=1)
+                
+                return [
+                    {
+                        'is_disaster': bool(prediction),
+                        'confidence': float(confidence),
+                        'method': 'ml_model'
+                    }
+                    for prediction, confidence in zip(predictions, confidences)
+                ]
             except Exception as e:
-                print(f"Error using ML model: {e}")
+                logger.exception("Error using ML model: %s", e)
         
         # Fallback to keyword matching
-        text_lower = text.lower()
-        disaster_score = sum(1 for keyword in self.disaster_keywords if keyword in text_lower)
+        return [self._classify_by_keywords(text) for text in texts]
+    
+    def _classify_by_keywords(self, text: str) -> Dict:
+        """Keyword-matching classification used when the ML model is unavailable"""
+        # Whole-word matches, so e.g. "fired" no longer counts as "fire"
+        tokens = set(KEYWORD_TOKEN_RE.findall(text.lower()))
+        disaster_score = len(tokens & self._disaster_keyword_set)
         is_disaster = disaster_score > 0
         confidence = min(0.5 + (disaster_score * 0.1), 0.95) if is_disaster else 0.3
         
@@ -149,7 +307,7 @@ class TwitterIntegrationService:
         }
         
         try:
-            response = requests.get(
+            response = (self.http_client or requests).get(
                 f"{self.base_url}/tweets/search/recent",
                 headers=headers,
                 params=params,
@@ -157,96 +315,127 @@ class TwitterIntegrationService:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
+                page = data.get('data', [])
+                includes = data.get('includes', {})
                 tweets = []
                 
-                for tweet in data.get('data', []):
-                    processed_tweet = self.process_tweet(tweet, data.get('includes', {}))
+                # Classify the whole page with one vectorizer/model call
+                classifications = self.classify_tweets_batch([tweet['text'] for tweet in page])
+                
+                for tweet, classification in zip(page, classifications):
+                    processed_tweet = self.process_tweet(tweet, includes, classification=classification)
                     tweets.append(processed_tweet)
+                self._score_batch(tweets)
                 
                 return tweets
             else:
-                print(f"API Error: {response.status_code} - {response.text}")
+                logger.warning("API Error: %s - %s", response.status_code, response.text)
                 return []
                 
         except Exception as e:
-            print(f"Error searching tweets: {e}")
+            logger.exception("Error searching tweets: %s", e)
             return []
     
-    def generate_simulated_tweet(self, force_disaster: bool = None) -> Dict:
-        """Generate a realistic simulated tweet"""
-        location = random.choice(self.sample_locations)
-        
-        # Determine if this should be a disaster tweet
-        if force_disaster is None:
-            is_disaster = random.random() < 0.3  # 30% chance of disaster tweet
-        else:
-            is_disaster = force_disaster
+    def _generate_batch(self, n: int, disaster_mask: np.ndarray) -> List[Dict]:
+        """Generate n simulated tweets, drawing every random field in bulk"""
+        rng = self._rng
+        
+        # One RNG call per field for the whole batch; tolist() keeps plain Python ints
+        location_idx = rng.integers(0, len(self.sample_locations), n).tolist()
+        disaster_template_idx = rng.integers(0, len(self.disaster_templates), n).tolist()
+        disaster_type_idx = rng.integers(0, len(self.disaster_types), n).tolist()
+        action_idx = rng.integers(0, len(self.action_phrases), n).tolist()
+        normal_template_idx = rng.integers(0, len(self.normal_templates), n).tolist()
+        minutes_ago = rng.integers(0, 61, n).tolist()
+        id_suffixes = rng.integers(1000, 10000, n).tolist()
+        author_ids = rng.integers(100000, 1000000, n).tolist()
+        metrics = rng.integers(0, [101, 501, 51], size=(n, 3)).tolist()
+        disaster_mask = disaster_mask.tolist()
+        timestamp = int(time.time())
+        
+        # Offsets are whole minutes in 0..60, so format each possible timestamp once
+        now = datetime.now()
+        created_at_by_offset = [(now - timedelta(minutes=minutes)).isoformat() for minutes in range(61)]
         
-        if is_disaster:
-            template = random.choice(self.disaster_templates)
-            disaster_type = random.choice(self.disaster_types)
-            action = random.choice(self.action_phrases)
+        tweets = []
+        for i in range(n):
+            location = self.sample_locations[location_idx[i]]
             
-            text = template.format(
-                disaster_type=disaster_type,
-                location=location['name'],
-                action_needed=action
-            )
-        else:
-            template = random.choice(self.normal_templates)
-            text = template.format(location=location['name'])
-        
-        # Generate realistic tweet metadata
-        tweet_id = f"sim_{int(time.time())}_{random.randint(1000, 9999)}"
-        created_at = datetime.now() - timedelta(minutes=random.randint(0, 60))
-        
-        return {
-            'id': tweet_id,
-            'text': text,
-            'created_at': created_at.isoformat(),
-            'author_id': f"user_{random.randint(100000, 999999)}",
-            'location': location['name'],
-            'coordinates': location['coords'],
-            'public_metrics': {
-                'retweet_count': random.randint(0, 100),
-                'like_count': random.randint(0, 500),
-                'reply_count': random.randint(0, 50)
-            },
-            'lang': 'en',
-            'simulation': True
-        }
+            if disaster_mask[i]:
+                text = self._disaster_formatters[disaster_template_idx[i]](
+                    self.disaster_types[disaster_type_idx[i]],
+                    location['name'],
+                    self.action_phrases[action_idx[i]]
+                )
+            else:
+                text = self._normal_formatters[normal_template_idx[i]](location['name'])
+            
+            retweet_count, like_count, reply_count = metrics[i]
+            
+            tweets.append({
+                'id': f"sim_{timestamp}_{id_suffixes[i]}",
+                'text': text,
+                'created_at': created_at_by_offset[minutes_ago[i]],
+                'author_id': f"user_{author_ids[i]}",
+                'location': location['name'],
+                'coordinates': location['coords'],
+                'public_metrics': {
+                    'retweet_count': retweet_count,
+                    'like_count': like_count,
+                    'reply_count': reply_count
+                },
+                'lang': 'en',
+                'simulation': True,
+                '_ground_truth_disaster': disaster_mask[i]
+            })
+        
+        return tweets
     
     def search_tweets_simulation(self, query: str, max_results: int = 5000) -> List[Dict]:
         """Generate simulated tweets for demonstration"""
-        tweets = []
-        
         # Generate a mix of disaster and normal tweets
         disaster_count = int(max_results * 0.4)  # 40% disaster tweets
-        normal_count = max_results - disaster_count
         
-        # Generate disaster tweets
-        for _ in range(disaster_count):
-            tweet = self.generate_simulated_tweet(force_disaster=True)
-            tweets.append(tweet)
+        # Scatter the disaster slots with a random permutation instead of shuffling afterwards
+        disaster_mask = self._rng.permutation(max_results) < disaster_count
+        tweets = self._generate_batch(max_results, disaster_mask)
         
-        # Generate normal tweets
-        for _ in range(normal_count):
-            tweet = self.generate_simulated_tweet(force_disaster=False)
-            tweets.append(tweet)
+        if self.evaluate_model_on_sim:
+            # Classify the whole batch with one vectorizer/model call
+            predictions = self.classify_tweets_batch([tweet['text'] for tweet in tweets])
+            agreed = sum(
+                prediction['is_disaster'] == tweet['_ground_truth_disaster']
+                for tweet, prediction in zip(tweets, predictions)
+            )
+            with self._classification_lock:
+                self.sim_model_agreement['evaluated'] += len(tweets)
+                self.sim_model_agreement['agreed'] += agreed
         
-        # Shuffle to make it realistic
-        random.shuffle(tweets)
+        classifications = [self._label_simulated(tweet) for tweet in tweets]
         
-        # Process tweets through classification
         processed_tweets = []
-        for tweet in tweets:
-            processed_tweet = self.process_tweet(tweet)
+        for tweet, classification in zip(tweets, classifications):
+            processed_tweet = self.process_tweet(tweet, classification=classification)
             processed_tweets.append(processed_tweet)
+        self._score_batch(processed_tweets)
         
         return processed_tweets
     
-    def process_tweet(self, tweet: Dict, includes: Dict = None) -> Dict:
+    def _label_simulated(self, tweet: Dict) -> Dict:
+        """Classification from the generator's own label, skipping the model"""
+        # Keyword confidence still varies by tweet, so priority scores stay spread out,
+        # but it is clamped to the side of 0.5 that matches the label
+        classification = self._classify_by_keywords(tweet['text'])
+        is_disaster = tweet['_ground_truth_disaster']
+        confidence = classification['confidence']
+        classification['is_disaster'] = is_disaster
+        classification['confidence'] = max(confidence, 0.5) if is_disaster else min(confidence, 0.3)
+        classification['method'] = 'simulation_label'
+        return classification
+    
+    def process_tweet(self, tweet: Dict, includes: Dict = None,
+                      classification: Optional[Dict] = None) -> Dict:
         """Process a raw tweet into our standardized format"""
         # Extract location information
         location = None
@@ -264,15 +453,16 @@ class TwitterIntegrationService:
                     location = user['location']
                     break
         
-        # Classify the tweet
-        classification = self.classify_tweet(tweet['text'])
-        
-        # Calculate priority score (reuse existing logic)
-        priority_score = self.calculate_priority_score(
-            tweet['text'], 
-            location, 
-            classification['confidence']
-        )
+        # Classify and score the tweet unless the caller batches both (see _score_batch)
+        if classification is None:
+            classification = self.classify_tweet(tweet['text'])
+            priority_score = self.calculate_priority_score(
+                tweet['text'], 
+                location, 
+                classification['confidence']
+            )
+        else:
+            priority_score = None
         
         return {
             'id': tweet['id'],
@@ -295,8 +485,7 @@ class TwitterIntegrationService:
         priority_score = base_confidence
         
         # Urgency boost
-        urgency_keywords = ['urgent', 'emergency', 'help', 'fire', 'earthquake', 'flood']
-        if any(keyword in text.lower() for keyword in urgency_keywords):
+        if PRIORITY_URGENCY_RE.search(text):
             priority_score += 0.15
         
         # Location boost
@@ -304,51 +493,106 @@ class TwitterIntegrationService:
             priority_score += 0.1
         
         # Keyword boost
-        disaster_keywords = ['disaster', 'emergency', 'evacuation', 'rescue']
-        if any(keyword in text.lower() for keyword in disaster_keywords):
+        if PRIORITY_DISASTER_RE.search(text):
             priority_score += 0.1
         
         return min(priority_score, 1.0)
     
+    def calculate_priority_scores_batch(self, texts: List[str], locations: List[str],
+                                        base_confidences: List[float]) -> List[float]:
+        """Calculate priority scores for many tweets in one vectorized pass"""
+        features = np.zeros((len(texts), 4))
+        
+        for i, (text, location, confidence) in enumerate(zip(texts, locations, base_confidences)):
+            features[i, 0] = confidence
+            features[i, 1] = PRIORITY_URGENCY_RE.search(text) is not None
+            features[i, 2] = bool(location)
+            features[i, 3] = PRIORITY_DISASTER_RE.search(text) is not None
+        
+        return _combine_priority_factors(features).tolist()
+    
+    def _score_batch(self, tweets: List[Dict]):
+        """Fill in priority_score for a batch of processed tweets in one pass"""
+        scores = self.calculate_priority_scores_batch(
+            [tweet['text'] for tweet in tweets],
+            [tweet['location'] for tweet in tweets],
+            [tweet['confidence'] for tweet in tweets]
+        )
+        for tweet, score in zip(tweets, scores):
+            tweet['priority_score'] = score
+    
     def search_tweets(self, query: str = None, max_results: int = 1000) -> List[Dict]:
         """Search for tweets (real or simulated based on mode)"""
         if query is None:
             # Default disaster-related query
-            query = ' OR '.join(self.disaster_keywords[:10])  # Use top 10 keywords
+            query = self._default_query
         
         if self.simulation_mode:
-            print(f"🔄 Generating {max_results} simulated tweets for query: {query}")
+            logger.debug("Generating %d simulated tweets for query: %s", max_results, query)
             return self.search_tweets_simulation(query, max_results)
         else:
-            print(f"🔍 Searching real tweets for query: {query}")
+            logger.debug("Searching real tweets for query: %s", query)
             return self.search_tweets_real(query, max_results)
     
     def start_streaming(self, callback_function, interval: int = 30):
         """Start streaming tweets at regular intervals"""
         self.tweet_callback = callback_function
         self.is_streaming = True
+        self._stop_event = threading.Event()
+        stop_event = self._stop_event
+        
+        # Fetching and the callback run on separate threads, so a slow callback
+        # no longer delays the next fetch
+        batches = queue.SimpleQueue()
         
         def stream_worker():
-            while self.is_streaming:
+            # Size each fetch to cover a whole interval at the observed tweet rate
+            expected_tps = STREAM_MIN_RESULTS / interval
+            last_fetch = None
+            
+            while not stop_event.is_set():
+                started = time.monotonic()
                 try:
                     # Fetch new tweets
-                    tweets = self.search_tweets(max_results=10)
+                    max_results = int(min(max(expected_tps * interval, STREAM_MIN_RESULTS), STREAM_MAX_RESULTS))
+                    tweets = self.search_tweets(max_results=max_results)
+                    
+                    if last_fetch is not None:
+                        observed_tps = len(tweets) / max(started - last_fetch, 1e-3)
+                        if len(tweets) >= max_results and not self.simulation_mode:
+                            observed_tps *= 2  # page came back full, the real rate is higher
+                        expected_tps += STREAM_RATE_SMOOTHING * (observed_tps - expected_tps)
+                    last_fetch = started
                     
                     # Filter for disaster tweets only
                     disaster_tweets = [t for t in tweets if t['is_disaster']]
                     
-                    if disaster_tweets and self.tweet_callback:
+                    if disaster_tweets:
+                        batches.put(disaster_tweets)
+                except Exception as e:
+                    logger.exception("Error in streaming: %s", e)
+                
+                # Wait out the rest of the interval, waking early on stop_streaming
+                stop_event.wait(max(interval - (time.monotonic() - started), 0))
+            
+            batches.put(None)  # lets callback_worker exit
+        
+        def callback_worker():
+            while True:
+                disaster_tweets = batches.get()
+                if disaster_tweets is None:
+                    break
+                
+                try:
+                    if self.tweet_callback:
                         self.tweet_callback(disaster_tweets)
-                    
-                    # Wait for next interval
-                    time.sleep(interval)
-                    
                 except Exception as e:
-                    print(f"Error in streaming: {e}")
-                    time.sleep(interval)
+                    logger.exception("Error in streaming: %s", e)
         
         self.stream_thread = threading.Thread(target=stream_worker, daemon=True)
+        self.callback_thread = threading.Thread(target=callback_worker, daemon=True)
         self.stream_thread.start()
+        self.callback_thread.start()
         
         mode = "simulation" if self.simulation_mode else "real API"
         print(f"🚀 Started Twitter streaming in {mode} mode (interval: {interval}s)")
@@ -356,8 +600,12 @@ class TwitterIntegrationService:
     def stop_streaming(self):
         """Stop the tweet streaming"""
         self.is_streaming = False
+        if self._stop_event:
+            self._stop_event.set()
         if self.stream_thread:
             self.stream_thread.join(timeout=5)
+        if self.callback_thread:
+            self.callback_thread.join(timeout=5)
         print("⏹️ Stopped Twitter streaming")
     
     def get_stream_status(self) -> Dict:
@@ -366,7 +614,8 @@ class TwitterIntegrationService:
             'is_streaming': self.is_streaming,
             'mode': 'simulation' if self.simulation_mode else 'real_api',
             'api_key_configured': bool(self.api_key),
-            'model_loaded': bool(self.model)
+            'model_loaded': bool(self.model),
+            'sim_model_agreement': dict(self.sim_model_agreement)
         }
 
 # Example usage and testing